@@ -23,7 +23,7 @@ from app.models.response import (
 from app.models.user import UserModel, UserStatus
 from app.utils.exceptions import CustomAccountLockedException, CustomBadRequestException
 from app.utils.response_messages import ResponseMessages
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.service.user_service import UserService
 from app.models.user import UserChangePasswordModel
@@ -59,7 +59,8 @@ router = APIRouter()
     description="Logs in user using form_data.",
     response_description="An access token, a refresh token and token type.",
 )
-async def login_user(
+def login_user(
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     _=Depends(build_request_context),
 ):
@@ -102,7 +103,7 @@ async def login_user(
         )
 
     if not verify_password(form_data.password, user.password_hash):
-        User.handle_failed_login(user.user_id)
+        UserService.handle_failed_login(user, background_tasks)
         logger.info(
             msg=f"Invalid credentials for user {user.user_id} at {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}",
         )
@@ -116,7 +117,7 @@ async def login_user(
         )
 
     # Reset failed login attempts on successful login
-    User.reset_failed_login_attempts(user.user_id)
+    UserService.reset_failed_login_attempts(user)
 
     # Generate access and refresh tokens
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -223,8 +224,9 @@ async def refresh_token(
     description="Change password using JSON body.",
     response_description="GenericResponseModel",
 )
-async def change_password(
+def change_password(
     form_data: UserChangePasswordModel,  # Use the model directly
+    background_tasks: BackgroundTasks,
     auth=Depends(authenticate_user_token),
     _=Depends(build_request_context),
 ):
@@ -245,7 +247,7 @@ async def change_password(
         raise CustomBadRequestException(ResponseMessages.ERR_USER_NOT_FOUND)
 
     if not verify_password(form_data.old_password, user.password_hash):
-        User.handle_failed_login(user.user_id)
+        UserService.handle_failed_login(user, background_tasks)
         logger.info(
             msg=f"Invalid credentials for user {user.user_id} at {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}",
         )
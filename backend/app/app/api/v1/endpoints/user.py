@@ -21,8 +21,11 @@ from app.data_adapter.email_log import EmailLog
 from app.service.email_service import EmailService
 from app.models.email_log import EmailLogModel
 from fastapi import APIRouter, Depends, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 
 
+# Endpoints that only do blocking DB work are plain `def`, so FastAPI runs them
+# in its threadpool instead of stalling the event loop.
 router = APIRouter()
 
 
@@ -55,7 +58,7 @@ router = APIRouter()
         },
     },
 )
-async def create_user(
+def create_user(
     user_data: UserCreateModel,  # The data for creating the user.
     background_tasks: BackgroundTasks,
     _=Depends(build_request_context),  # Build the request context.
@@ -72,7 +75,7 @@ async def create_user(
     """
     # Call the create_user method of the UserService class to create the user
     # The UserService.create_user method takes in the user_data and returns a GenericResponseModel
-    response: GenericResponseModel = await UserService.create_user(
+    response: GenericResponseModel = UserService.create_user(
         user_data,
         background_tasks  # The data for creating the user.
     )
@@ -89,7 +92,7 @@ async def create_user(
     summary="Get Parent Organizer",
     description="Retrieve the parent organizer of a user by their ID.",
 )
-async def get_parent_organizer(
+def get_parent_organizer(
     user_id: int,
     auth=Depends(authenticate_user_token),  # The authentication token.
     _=Depends(build_request_context),  # Build the request context.
@@ -117,7 +120,7 @@ async def get_parent_organizer(
     summary="Get User Role",
     description="Retrieve the role of a user by their ID.",
 )
-async def get_user_role(
+def get_user_role(
     user_id: int,  # The authentication token.
     _=Depends(build_request_context),  # Build the request context.
 ):
@@ -162,7 +165,7 @@ async def get_user_role(
         },
     },
 )
-async def get_user_by_id(
+def get_user_by_id(
     user_id: int,  # The ID of the user.
     auth=Depends(authenticate_user_token),  # The authentication token.
     _=Depends(build_request_context),  # Build the request context.
@@ -182,6 +185,7 @@ async def get_user_by_id(
     # Call the get_user_by_id method of the UserService class to get the user
     response: GenericResponseModel = UserService.get_user_by_id(
         user_id,
+        auth,
     )
 
     # Return the response after adding the request context
@@ -215,7 +219,7 @@ async def get_user_by_id(
         },
     },
 )
-async def delete_user(
+def delete_user(
     user_id: int,  # The ID of the user to be deleted.
     auth=Depends(authenticate_user_token),  # The authentication token.
     _=Depends(build_request_context),  # Build the request context.
@@ -237,6 +241,7 @@ async def delete_user(
     # Call the delete_user method of the UserService class to delete the user
     response: GenericResponseModel = UserService.delete_user(
         user_id,
+        auth,
     )
 
     # Return the response after adding the request context
@@ -266,7 +271,7 @@ async def delete_user(
         },
     },
 )
-async def update_user(
+def update_user(
     user_id: int,  # The ID of the user to be updated.
     user_data: UserUpdateModel,  # The data of the user to be updated.
     auth=Depends(authenticate_user_token),  # The authentication token.
@@ -289,7 +294,7 @@ async def update_user(
 
     # Call the update_user method of the UserService class to update the user
     print(user_data)
-    response: GenericResponseModel = UserService.update_user(user_id, user_data)
+    response: GenericResponseModel = UserService.update_user(user_id, user_data, auth)
 
     # Return the response after adding the request context
     return build_api_response(response)
@@ -320,11 +325,14 @@ async def update_user(
         },
     },
 )
-async def get_all_users(
+def get_all_users(
     current_page: int = Query(1, description="Page number of the results"),
     items_per_page: int = Query(10, description="Number of results per page"),
     filter_params: Optional[str] = Query(None, alias="filter_params"),
     sorting_params: Optional[str] = Query(None, alias="sorting_params"),
+    with_count: bool = Query(
+        True, description="Compute total_items and total_pages (skip for has_next only)"
+    ),
     auth=Depends(authenticate_user_token),  # The authentication token.
     _=Depends(build_request_context),
 ):
@@ -338,6 +346,7 @@ async def get_all_users(
         - items_per_page (int): The number of results per page. Default is 10.
         - filter_params (Optional[str]): The filter parameters for the query.
         - sorting_params (Optional[str]): The sorting parameters for the query.
+        - with_count (bool): Whether to run the COUNT query. Default is True.
         - auth (Depends): The authentication token.
         - _ (Depends): The request context.
 
@@ -357,13 +366,60 @@ async def get_all_users(
 
     # Call the get_all_users method of the UserService class to get all users
     response: GenericResponseModel = UserService.get_all_users(
-        current_page, items_per_page, filters, sorting
+        current_page, items_per_page, filters, sorting, with_count
     )
 
     # Return the response after adding the request context
     return build_api_response(response)
 
 
+@router.get(
+    "s/export/",
+    status_code=status.HTTP_200_OK,
+    summary="Export all users.",
+    description="Stream all users matching the filters as newline-delimited JSON.",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Successful export of users",
+        },
+        401: {
+            "model": GenericResponseModel,
+            "description": "Invalid authentication token",
+        },
+        500: {
+            "model": GenericResponseModel,
+            "description": "Internal Server Error",
+        },
+    },
+)
+def export_users(
+    filter_params: Optional[str] = Query(None, alias="filter_params"),
+    sorting_params: Optional[str] = Query(None, alias="sorting_params"),
+    auth=Depends(authenticate_user_token),  # The authentication token.
+    _=Depends(build_request_context),
+) -> StreamingResponse:
+    """
+    Export all users.
+
+    Unlike the paged users endpoint, the whole result is streamed row by row, so
+    memory stays flat for large exports.
+
+    Parameters:
+        - filter_params (Optional[str]): The filter parameters for the query.
+        - sorting_params (Optional[str]): The sorting parameters for the query.
+        - auth (Depends): The authentication token.
+        - _ (Depends): The request context.
+
+    Returns:
+        StreamingResponse: The users, one JSON object per line.
+    """
+    filters = parse_json_params(filter_params) if filter_params else None
+    sorting = parse_json_params(sorting_params) if sorting_params else None
+
+    return UserService.export_users(filters, sorting)
+
+
 @router.get(
     "/pending-approval/",
     status_code=status.HTTP_200_OK,
@@ -385,7 +441,7 @@ async def get_all_users(
         },
     },
 )
-async def get_pending_approval_requests(
+def get_pending_approval_requests(
     current_page: int = Query(1, ge=1, description="The page number to fetch"),
     items_per_page: int = Query(
         10, ge=1, le=100, description="The number of items per page"
@@ -396,6 +452,9 @@ async def get_pending_approval_requests(
     sorting_params: Optional[str] = Query(
         None, description="JSON string of sorting parameters"
     ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page, replaces current_page"
+    ),
     auth=Depends(authenticate_user_token),
     _=Depends(build_request_context),
 ):
@@ -409,6 +468,7 @@ async def get_pending_approval_requests(
         - items_per_page (int): The number of items per page. Default is 10, maximum is 100.
         - filter_params (Optional[str]): JSON string of filter parameters.
         - sorting_params (Optional[str]): JSON string of sorting parameters.
+        - cursor (Optional[str]): The next_cursor of the previous page. Only used without sorting_params.
         - auth (Depends): The authentication token.
         - _ (Depends): The request context.
 
@@ -426,6 +486,7 @@ async def get_pending_approval_requests(
         items_per_page,
         json.loads(filter_params) if filter_params else None,
         json.loads(sorting_params) if sorting_params else None,
+        cursor,
     )
     return build_api_response(response)
 
@@ -455,7 +516,7 @@ async def get_pending_approval_requests(
         },
     },
 )
-async def approve_user(
+def approve_user(
     user_id: int,
     background_tasks: BackgroundTasks,
     auth=Depends(authenticate_user_token),
@@ -510,7 +571,7 @@ async def approve_user(
         },
     },
 )
-async def reject_user(
+def reject_user(
     user_id: int,
     reason: str = Query(..., description="Reason for rejection"),
     auth=Depends(authenticate_user_token),
@@ -562,7 +623,7 @@ async def reject_user(
         },
     },
 )
-async def search_organizers(
+def search_organizers(
     current_page: int = Query(1, description="Page number of the results"),
     items_per_page: int = Query(10, description="Number of results per page"),
     filter_params: Optional[str] = Query(None, alias="filter_params"),
@@ -645,7 +706,7 @@ async def test_email_sending(
     
 
 @router.get("/get-pending-emails/")
-async def get_pending_emails(
+def get_pending_emails(
     auth=Depends(authenticate_user_token),
     _=Depends(build_request_context),
     ):
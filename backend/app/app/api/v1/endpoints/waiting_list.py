@@ -118,6 +118,10 @@ async def get_waiting_list(
     sorting_params: Optional[str] = Query(
         None, alias="sorting_params", description="JSON string of sorting parameters"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of the previous page; replaces current_page when no sorting is given",
+    ),
     auth=Depends(authenticate_user_token),
     _=Depends(build_request_context),
 ) -> GenericResponseModel:
@@ -133,6 +137,7 @@ async def get_waiting_list(
         items_per_page (int): The number of items to display per page.
         filter_params (Optional[str]): JSON string containing filter parameters.
         sorting_params (Optional[str]): JSON string containing sorting parameters.
+        cursor (Optional[str]): The next_cursor of the previous page for keyset pagination.
         auth (dict): The authenticated user's information (injected by dependency).
         _ (None): Placeholder for request context building (injected by dependency).
 
@@ -152,7 +157,7 @@ async def get_waiting_list(
     sorting = parse_json_params(sorting_params) if sorting_params else None
 
     response: GenericResponseModel = WaitingListService.get_waiting_list(
-        event_date_id, current_page, items_per_page, filters, sorting
+        event_date_id, current_page, items_per_page, filters, sorting, cursor
     )
     return build_api_response(response)
 
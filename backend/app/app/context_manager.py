@@ -1,7 +1,8 @@
 import uuid
 from contextvars import ContextVar
-from typing import Generator, Optional
+from typing import Any, Callable, Generator, Optional
 
+from app.database import SessionLocal
 from app.dependencies import get_db
 from app.logger import logger
 from app.models.user import UserModel, UserStatus, UserTokenData
@@ -23,6 +24,7 @@ context_actor_user_data: ContextVar[Optional[UserTokenData]] = ContextVar(
 context_set_db_session_rollback: ContextVar[bool] = ContextVar(
     "set_db_session_rollback", default=False
 )
+context_user_roles: ContextVar[Optional[dict]] = ContextVar("user_roles", default=None)
 
 
 async def build_request_context(
@@ -47,6 +49,7 @@ async def build_request_context(
 
     context_db_session.set(db)
     context_id_api.set(str(uuid.uuid4()))
+    context_user_roles.set({})
     context_id_user.set(request.headers.get("X-User-ID"))
 
     # User part
@@ -93,3 +96,27 @@ async def build_request_context(
 def get_db_session() -> Session:
     """common method to get db session from context variable"""
     return context_db_session.get()
+
+
+def run_with_own_session(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run func with a dedicated database session in the context.
+
+    Background tasks run after get_db has closed the request session, so
+    they open their own and close it when they finish.
+
+    Args:
+        func (Callable[..., Any]): The function to run.
+        *args (Any): Positional arguments for func.
+        **kwargs (Any): Keyword arguments for func.
+
+    Returns:
+        Any: The result of func.
+    """
+    db = SessionLocal()
+    token = context_db_session.set(db)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        context_db_session.reset(token)
+        db.close()
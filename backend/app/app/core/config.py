@@ -30,6 +30,14 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     DATABASE_PORT: int
 
+    # Redis
+    REDIS_URL: str = "redis://redis:6379/0"
+
+    # Process the waiting list automatically when a reservation frees spots
+    WAITING_LIST_AUTO_PROCESS: bool = False
+    # Waiting list processing triggers are coalesced over this window
+    WAITING_LIST_BATCH_WINDOW_MS: int = 50
+
     # Email
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -0,0 +1,12 @@
+import redis
+
+from app.core.config import settings
+
+# Connections are opened lazily on the first command. Short timeouts let
+# callers fall back to the database instead of hanging on a stalled Redis.
+redis_client = redis.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=0.5,
+    socket_connect_timeout=0.5,
+)
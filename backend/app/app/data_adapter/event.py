@@ -17,8 +17,16 @@ from sqlalchemy import (
     Boolean,
     text,
     select,
+    update,
+    and_,
+    cast,
+    Date,
+    Time,
+    Interval,
+    event as sa_event,
 )
 from app.logger import logger
+from app.utils.ttl_cache import TTLCache
 from sqlalchemy.orm import relationship, joinedload
 from datetime import date, datetime, time, timedelta
 from app.database import Base
@@ -33,6 +41,7 @@ from app.models.event import (
     EventDateModel,
 )
 from app.context_manager import get_db_session
+from app.event_listeners import queue_statement_log_events, row_data
 from app.models.get_params import ParameterValidator, parse_json_params
 import typing
 from app.data_adapter.attachment import Attachment
@@ -1044,6 +1053,12 @@ class Event(Base):
         }
 
 
+# Short TTL bounds staleness for writes that bypass the ORM listeners below.
+# Entries are plain _to_model() dicts, never ORM instances, so threads can
+# share them without touching a session.
+_event_date_cache = TTLCache(maxsize=10_000, ttl=5)
+
+
 class EventDate(Base):
     __tablename__ = "event_date"
 
@@ -1128,6 +1143,37 @@ class EventDate(Base):
             EventStatus.SENT_PAYMENT,
         ]
 
+    @classmethod
+    def unlocked_clause(cls, now: Optional[datetime] = None):
+        """
+        SQL counterpart of ``not is_locked()`` for use in WHERE clauses.
+
+        By default the clock is the database's LOCALTIMESTAMP, so every
+        replica enforces the lock against the same time source.
+
+        Args:
+            now (Optional[datetime]): An explicit local time to compare against instead of the database clock.
+
+        Returns:
+            ColumnElement: A boolean SQL expression that is true while the event date accepts changes.
+        """
+        if now is None:
+            now = func.localtimestamp()
+        lock_time = cast(cls.date, Date) + cast(cls.time, Time) - func.make_interval(
+            0, 0, 0, 0, cls.lock_time_hours, type_=Interval
+        )
+        return and_(
+            lock_time > now,
+            cls.status.notin_(
+                [
+                    EventStatus.COMPLETED,
+                    EventStatus.COMPLETED_UNPAID,
+                    EventStatus.CANCELLED,
+                    EventStatus.SENT_PAYMENT,
+                ]
+            ),
+        )
+
     def book_seats(self, seats: int) -> bool:
         """
         Book a specified number of seats for the event.
@@ -1137,6 +1183,65 @@ class EventDate(Base):
             return True
         return False
 
+    @classmethod
+    def lock_for_update(
+        cls, event_date_id: int
+    ) -> Optional[Tuple["EventDate", bool]]:
+        """
+        Load an event date with SELECT ... FOR UPDATE in the current transaction.
+
+        The lock is held until the caller commits or rolls back, serialising
+        writers that change the event date's spots.
+
+        Args:
+            event_date_id (int): The ID of the event date.
+
+        Returns:
+            Optional[Tuple[EventDate, bool]]: The event date and whether it is unlocked for changes, or None if not found.
+        """
+        db = get_db_session()
+        return (
+            db.query(cls, cls.unlocked_clause().label("is_unlocked"))
+            .filter(cls.id == event_date_id)
+            .with_for_update(of=cls)
+            .first()
+        )
+
+    @classmethod
+    def decrement_spots(cls, event_date_id: int, seats: int) -> bool:
+        """
+        Atomically subtract seats from an event date's available spots.
+
+        The statement is not committed so it can share a transaction with the
+        caller's other writes. It returns the updated row, so the audit log
+        row is queued without another query.
+
+        Args:
+            event_date_id (int): The ID of the event date.
+            seats (int): The number of seats to subtract.
+
+        Returns:
+            bool: True if the spots were decremented, False if the event date is missing or lacks capacity.
+        """
+        db = get_db_session()
+        event_date = db.scalars(
+            update(cls)
+            .where(cls.id == event_date_id, cls.available_spots >= seats)
+            .values(available_spots=cls.available_spots - seats)
+            .returning(cls)
+            # Refresh the instance lock_for_update loaded into the session
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).first()
+        if event_date is None:
+            return False
+
+        new_data = row_data(event_date)
+        old_data = {**new_data, "available_spots": event_date.available_spots + seats}
+        queue_statement_log_events(
+            db, cls.__tablename__, [(event_date.id, old_data, new_data)]
+        )
+        return True
+
     def _to_model(self) -> Dict[str, Any]:
         """
         Convert the EventDate instance to a dictionary representation.
@@ -1155,10 +1260,27 @@ class EventDate(Base):
         }
 
     @classmethod
-    def get_event_date_by_id(cls, event_date_id: int) -> Optional["EventDate"]:
+    def get_event_date_by_id(
+        cls, event_date_id: int, use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve an event date by its ID, including locked event dates.
+
+        Results are kept in a short-lived in-process cache that is also
+        invalidated whenever the event date or one of its reservations is
+        written through the ORM.
+
+        Args:
+            event_date_id (int): The ID of the event date.
+            use_cache (bool): Whether a cached row may be returned. Pass False when the caller decides on fresh capacity.
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the event date's _to_model() dictionary, or None if not found.
         """
+        if use_cache:
+            cached = _event_date_cache.get(event_date_id)
+            if cached is not None:
+                return dict(cached)
         try:
             with get_db_session() as db:
                 event_date = (
@@ -1167,11 +1289,25 @@ class EventDate(Base):
                     .filter(cls.id == event_date_id)
                     .first()
                 )
-                return event_date
+                if event_date is None:
+                    return None
+                event_date_dict = event_date._to_model()
+                _event_date_cache.set(event_date_id, event_date_dict)
+                return dict(event_date_dict)
         except Exception as e:
             print(f"Error retrieving event date: {str(e)}")
             return None
 
+    @staticmethod
+    def invalidate(event_date_id: int) -> None:
+        """
+        Drop an event date from the lookup cache.
+
+        Args:
+            event_date_id (int): The ID of the event date.
+        """
+        _event_date_cache.pop(event_date_id)
+
     @classmethod
     def update_past_event_statuses(cls, db: Session):
         """
@@ -1248,6 +1384,12 @@ class EventDate(Base):
             db.close()
 
 
+@sa_event.listens_for(EventDate, "after_update")
+@sa_event.listens_for(EventDate, "after_delete")
+def _invalidate_event_date(mapper, connection, target: EventDate) -> None:
+    EventDate.invalidate(target.id)
+
+
 class EventClaim(Base):
     """
     Represents a claim for creating, updating, or cancelling an event or event date.
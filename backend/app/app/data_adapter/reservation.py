@@ -1,10 +1,22 @@
 from typing import Dict, Any, List, Optional, Tuple, Union
 from app.models.reservation import ReservationStatus, ReservationUpdateModel
-from sqlalchemy import Column, Integer, ForeignKey, Text, String, Enum, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    Text,
+    String,
+    Enum,
+    DateTime,
+    insert,
+    select,
+    event as sa_event,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 from app.context_manager import get_db_session
+from app.event_listeners import queue_statement_log_events, row_data
 from app.data_adapter.event import Event
 from app.data_adapter.event import EventDate
 from app.models.reservation import ReservationCreateModel
@@ -424,6 +436,77 @@ class Reservation(Base):
             ):
                 return code
 
+    @classmethod
+    def generate_local_codes(cls, session, count: int) -> List[str]:
+        """
+        Generate several unique local reservation codes with one lookup per attempt.
+
+        Args:
+            session: The database session.
+            count (int): The number of codes to generate.
+
+        Returns:
+            List[str]: A list of unique local reservation codes.
+        """
+        import random
+        import string
+
+        codes = set()
+        while len(codes) < count:
+            candidates = {
+                "".join(random.choices(string.ascii_uppercase + string.digits, k=8))
+                for _ in range(count - len(codes))
+            } - codes
+            taken = set(
+                session.execute(
+                    select(cls.local_reservation_code).where(
+                        cls.local_reservation_code.in_(candidates)
+                    )
+                ).scalars()
+            )
+            codes |= candidates - taken
+        return list(codes)
+
+    @classmethod
+    def bulk_create(cls, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert several reservations with a single multi-row INSERT.
+
+        Local reservation codes are assigned here. The statement is not
+        committed so it can share a transaction with the caller's other writes,
+        and the audit log rows of the inserted reservations are queued for
+        that transaction's commit.
+
+        Args:
+            rows (List[Dict[str, Any]]): Column values for each reservation.
+
+        Returns:
+            int: The number of reservations inserted.
+        """
+        if not rows:
+            return 0
+        session = get_db_session()
+        codes = cls.generate_local_codes(session, len(rows))
+        now = datetime.utcnow()
+        created = session.scalars(
+            insert(cls).returning(cls),
+            [
+                {
+                    **row,
+                    "local_reservation_code": code,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for row, code in zip(rows, codes)
+            ],
+        ).all()
+        queue_statement_log_events(
+            session,
+            cls.__tablename__,
+            [(reservation.id, None, row_data(reservation)) for reservation in created],
+        )
+        return len(created)
+
     @classmethod
     def cancel_reservation(cls, reservation_id: int) -> Dict[str, Any]:
         """
@@ -603,4 +686,12 @@ class Reservation(Base):
             cls.status != ReservationStatus.CANCELLED
         ).all()
 
-        return reservations
\ No newline at end of file
+        return reservations
+
+
+@sa_event.listens_for(Reservation, "after_insert")
+@sa_event.listens_for(Reservation, "after_update")
+@sa_event.listens_for(Reservation, "after_delete")
+def _invalidate_reservation_event_date(mapper, connection, target: Reservation) -> None:
+    # Reservations feed EventDate.total_attendees and available spots
+    EventDate.invalidate(target.event_date_id)
@@ -1,9 +1,5 @@
-import app.api.v1.endpoints
-import app.logger
-import bcrypt
 from datetime import datetime, timedelta
-import starlette.responses
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 from pytz import timezone
 from app.database import Base
 from app.models.get_params import ParameterValidator
@@ -15,13 +11,12 @@ from app.models.user import (
     UserUpdateModel,
     UserRole,
 )
-from pydantic import EmailStr
-from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String, ForeignKey, or_
+from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String, ForeignKey, Index, or_, null, tuple_, update, select
 from sqlalchemy.orm import Mapped, relationship
 from app.data_adapter.reservation import Reservation
 from app.data_adapter.school import School
-import app.context_manager
 from app.context_manager import get_db_session
+from app.event_listeners import queue_statement_log_events, row_data
 from app.data_adapter.report import Report, ReportType
 
 if TYPE_CHECKING:
@@ -29,12 +24,15 @@ if TYPE_CHECKING:
 
 
 from app.logger import logger
-from app.models.user import UserModel
 from app.models.school import SchoolUpdateModel
-from sqlalchemy.orm import joinedload, backref
+from sqlalchemy.orm import Session, joinedload, backref, selectinload
 from app.data_adapter.event import EventClaim
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from psycopg2.errorcodes import UNIQUE_VIOLATION
+
+
+_SLOVAKIA_TZ = timezone("Europe/Bratislava")
 
 
 class User(Base):
@@ -91,6 +89,16 @@ class User(Base):
     waiting_list = relationship("WaitingList", back_populates="user")
     reports = relationship("Report", back_populates="user")
 
+    __table_args__ = (
+        # Keyset pagination of the pending approval queue
+        Index(
+            "ix_user_status_created_at_user_id",
+            status,
+            created_at.desc(),
+            user_id.desc(),
+        ),
+    )
+
     def build_user_token_data(self) -> UserTokenData:
         return UserTokenData(
             user_id=self.user_id,
@@ -182,7 +190,67 @@ class User(Base):
         db = get_db_session()
         user = db.query(cls).filter(cls.user_email == email).first()
         return user._to_model() if user else None
-    
+
+    @classmethod
+    def preflight_create(
+        cls, email: str, ico: Optional[str] = None
+    ) -> tuple[Optional[int], Optional[int]]:
+        """
+        Check email and school ICO availability in a single query.
+
+        Both lookups are issued as scalar subqueries of one SELECT, so the
+        signup path pays a single round-trip before the INSERT.
+
+        Args:
+            email (str): The email of the user being created.
+            ico (Optional[str]): The ICO of the school being registered, if any.
+
+        Returns:
+            tuple[Optional[int], Optional[int]]: The ID of the user already using the email
+            and the ID of the school already registered under the ICO (None when free).
+        """
+        db = get_db_session()
+        existing_user_id = (
+            db.query(cls.user_id)
+            .filter(cls.user_email == email)
+            .limit(1)
+            .scalar_subquery()
+        )
+        existing_school_id = (
+            db.query(School.id).filter(School.ico == ico).limit(1).scalar_subquery()
+            if ico
+            else null()
+        )
+        return tuple(db.query(existing_user_id, existing_school_id).one())
+
+    @classmethod
+    def preflight_update(
+        cls, user_id: int, email: Optional[str]
+    ) -> tuple[bool, Optional[int]]:
+        """
+        Check that a user exists and whether the new email is taken, in a single query.
+
+        Args:
+            user_id (int): The ID of the user being updated.
+            email (Optional[str]): The new email of the user.
+
+        Returns:
+            tuple[bool, Optional[int]]: Whether the user exists and the ID of the user
+            already using the email (None when free).
+        """
+        db = get_db_session()
+        user_exists = db.query(cls.user_id).filter(cls.user_id == user_id).exists()
+        existing_user_id = (
+            db.query(cls.user_id)
+            .filter(cls.user_email == email)
+            .limit(1)
+            .scalar_subquery()
+            if email
+            else null()
+        )
+        exists, email_owner_id = db.query(user_exists, existing_user_id).one()
+        return bool(exists), email_owner_id
+
     @classmethod
     def change_password(cls, user_id: int, new_password: str) -> bool:
         """
@@ -281,10 +349,28 @@ class User(Base):
         )
 
         db.add(new_user)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise
         db.refresh(new_user)
         return new_user
 
+    @staticmethod
+    def is_email_conflict(error: IntegrityError) -> bool:
+        """
+        Check whether an IntegrityError is a unique violation on user_email.
+
+        Args:
+            error (IntegrityError): The error raised by the database.
+
+        Returns:
+            bool: True if the email is already taken, False otherwise.
+        """
+        pgcode = getattr(error.orig, "pgcode", None)
+        return pgcode == UNIQUE_VIOLATION and "user_email" in str(error.orig)
+
     @classmethod
     def get_all_users(cls) -> list[UserModel]:
         """
@@ -398,7 +484,8 @@ class User(Base):
         items_per_page: int,
         filter_params: Optional[List[Dict[str, str]]],
         sorting_params: Optional[List[Dict[str, str]]],
-    ) -> tuple[List[UserModel], int]:
+        with_count: bool = True,
+    ) -> tuple[List[UserModel], Optional[int], bool]:
         """
         Get users by filters.
 
@@ -407,10 +494,13 @@ class User(Base):
             items_per_page (int): The number of items per page.
             filter_params (Optional[FilterParams]): The filter parameters.
             sorting_params (Optional[Dict[str, str]]): The sorting parameters.
+            with_count (bool): Whether to run the COUNT query. When False, one extra
+                row is fetched instead to tell whether a next page exists.
 
         Returns:
             List[UserModel]: The list of users if found, otherwise an empty list.
-            int: Total count of users matching the filter criteria.
+            Optional[int]: Total count of users matching the filter criteria, None if not counted.
+            bool: Whether there is a next page.
         """
         from app.context_manager import get_db_session
 
@@ -425,14 +515,54 @@ class User(Base):
             sorting_params,
         )
 
-        total_count = query.count()
-        users = (
-            query.offset((current_page - 1) * items_per_page)
-            .limit(items_per_page)
-            .all()
+        offset = (current_page - 1) * items_per_page
+        if with_count:
+            total_count = query.count()
+            users = query.offset(offset).limit(items_per_page).all()
+            has_next = offset + len(users) < total_count
+        else:
+            total_count = None
+            users = query.offset(offset).limit(items_per_page + 1).all()
+            has_next = len(users) > items_per_page
+            users = users[:items_per_page]
+
+        return [user._to_model() for user in users], total_count, has_next
+
+    @classmethod
+    def iter_users(
+        cls,
+        db: Session,
+        filter_params: Optional[List[Dict[str, str]]],
+        sorting_params: Optional[List[Dict[str, str]]],
+        batch_size: int = 500,
+    ) -> Iterator[UserModel]:
+        """
+        Iterate over all users matching the filters without loading them all at once.
+
+        Rows are fetched from a server-side cursor in batches of batch_size, so
+        memory stays bounded regardless of the size of the result.
+
+        Args:
+            db (Session): The database session to stream from.
+            filter_params (Optional[FilterParams]): The filter parameters.
+            sorting_params (Optional[Dict[str, str]]): The sorting parameters.
+            batch_size (int): The number of rows fetched per round-trip.
+
+        Yields:
+            UserModel: The users matching the filter criteria.
+        """
+        query = db.query(cls).options(
+            joinedload(cls.school), selectinload(cls.employees)
+        )
+        query = ParameterValidator.apply_filters_and_sorting(
+            query,
+            cls,
+            filter_params,
+            sorting_params,
         )
 
-        return [user._to_model() for user in users], total_count
+        for user in query.yield_per(batch_size):
+            yield user._to_model()
 
     MAX_LOGIN_ATTEMPTS = 5
     LOCKOUT_DURATION = timedelta(minutes=5)
@@ -451,8 +581,7 @@ class User(Base):
         user = db.query(cls).filter(cls.user_id == user_id).first()
         if user:
             user.failed_login_attempts += 1
-            slovakia_tz = timezone("Europe/Bratislava")
-            current_time = datetime.now(slovakia_tz)
+            current_time = datetime.now(_SLOVAKIA_TZ)
             user.last_failed_login = current_time
 
             if user.failed_login_attempts >= cls.MAX_LOGIN_ATTEMPTS:
@@ -483,38 +612,46 @@ class User(Base):
         """
         Get the role of a user by their ID.
 
-        This class method queries the database to find a user by their ID
-        and returns their role if found.
-
         Args:
             user_id (int): The ID of the user whose role we want to retrieve.
 
         Returns:
             Optional[str]: The user's role if found, None otherwise.
         """
-        from app.context_manager import get_db_session
-
-        db = get_db_session()
-        user = db.query(cls).filter(cls.user_id == user_id).first()
-
-        if user:
-            return user.role
-        return None
+        return cls.get_user_roles([user_id])[user_id]
 
     @classmethod
-    def get_user_role(cls, user_id: int) -> Optional[str]:
+    def get_user_roles(cls, user_ids: List[int]) -> Dict[int, Optional[str]]:
         """
-        Get the role of a user by their ID.
+        Get the roles of several users with a single query.
+
+        Roles are cached for the current request, so repeated lookups only
+        query the users that have not been resolved yet.
 
         Args:
-            user_id (int): The ID of the user whose role we want to retrieve.
+            user_ids (List[int]): The IDs of the users whose roles we want to retrieve.
 
         Returns:
-            Optional[str]: The user's role if found, None otherwise.
+            Dict[int, Optional[str]]: The role of each user, None if the user does not exist.
         """
-        with get_db_session() as db:
-            user = db.query(cls).filter(cls.user_id == user_id).first()
-            return user.role if user else None
+        from app.context_manager import context_user_roles
+
+        roles = context_user_roles.get()
+        if roles is None:
+            roles = {}
+
+        missing_ids = {user_id for user_id in user_ids if user_id not in roles}
+        if missing_ids:
+            db = get_db_session()
+            rows = (
+                db.query(cls.user_id, cls.role)
+                .filter(cls.user_id.in_(missing_ids))
+                .all()
+            )
+            roles.update(dict.fromkeys(missing_ids))
+            roles.update({user_id: role for user_id, role in rows})
+
+        return {user_id: roles[user_id] for user_id in user_ids}
 
     @classmethod
     def get_users_by_status(
@@ -524,19 +661,28 @@ class User(Base):
         items_per_page: int,
         filter_params: Optional[List[Dict[str, str]]] = None,
         sorting_params: Optional[List[Dict[str, str]]] = None,
-    ) -> tuple[List[UserModel], int]:
+        cursor: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[List[UserModel], Optional[int], Optional[tuple[datetime, int]]]:
         """
         Get users by status with pagination, filtering, and sorting.
 
+        Without sorting_params the users are ordered by (created_at, user_id)
+        descending, which is stable while rows are approved or rejected. In that
+        order a keyset cursor can be passed instead of a page number.
+
         Args:
             user_status (UserStatus): The status of users to retrieve.
-            current_page (int): The current page number.
+            current_page (int): The current page number, ignored when a cursor is given.
             items_per_page (int): The number of items per page.
             filter_params (Optional[List[Dict[str, str]]]): The filters to apply.
             sorting_params (Optional[List[Dict[str, str]]]): The sorting parameters to apply.
+            cursor (Optional[tuple[datetime, int]]): The (created_at, user_id) of the
+                last user of the previous page.
 
         Returns:
-            Tuple[List[Dict[str, Any]], int]: A tuple containing a list of user dictionaries and the total count.
+            Tuple[List[Dict[str, Any]], Optional[int], Optional[tuple[datetime, int]]]: A tuple
+            containing a list of user dictionaries, the total count (None when a cursor is
+            given) and the keyset position of the next page.
         """
         with get_db_session() as session:
             query = session.query(cls).filter(cls.status == user_status)
@@ -546,40 +692,91 @@ class User(Base):
                 query, cls, filter_params, sorting_params
             )
 
-            # Get total count
-            total_count = query.count()
+            if sorting_params:
+                total_count = query.count()
+                users = (
+                    query.offset((current_page - 1) * items_per_page)
+                    .limit(items_per_page)
+                    .all()
+                )
+                return [user._to_model() for user in users], total_count, None
 
-            # Apply pagination
-            users = (
-                query.offset((current_page - 1) * items_per_page)
-                .limit(items_per_page)
-                .all()
+            # Keyset pagination over (created_at, user_id); order_by(None) drops
+            # the default user_id ordering, which order_by would otherwise extend
+            query = query.order_by(None).order_by(
+                cls.created_at.desc(), cls.user_id.desc()
             )
+            # Counting would scan the whole queue on every cursor page
+            total_count = None if cursor else query.count()
+            if cursor:
+                query = query.filter(
+                    tuple_(cls.created_at, cls.user_id) < tuple_(*cursor)
+                )
+            else:
+                query = query.offset((current_page - 1) * items_per_page)
+
+            users = query.limit(items_per_page + 1).all()
+            next_position = None
+            if len(users) > items_per_page:
+                users = users[:items_per_page]
+                next_position = (users[-1].created_at, users[-1].user_id)
 
-            return [user._to_model() for user in users], total_count
+            return [user._to_model() for user in users], total_count, next_position
 
     @classmethod
     def update_user_status(
-        cls, user_id: int, new_status: UserStatus, reason: Optional[str] = None
+        cls,
+        user_id: int,
+        new_status: UserStatus,
+        reason: Optional[str] = None,
+        expected_status: Optional[UserStatus] = None,
     ) -> Optional[UserModel]:
         """
         Update a user's status and optionally store the reason for the status change.
 
+        The change is a single UPDATE ... RETURNING statement. When expected_status
+        is given, only a user currently in that status is updated, so concurrent
+        transitions cannot both succeed. The statement bypasses the flush
+        listeners, so it also returns the previous values from a locked
+        subquery and queues the audit log row itself.
+
         Args:
             user_id (int): The ID of the user to update.
             new_status (UserStatus): The new status to set for the user.
             reason (Optional[str]): The reason for the status change, if applicable.
+            expected_status (Optional[UserStatus]): The status the user must currently have.
 
         Returns:
             Optional[UserModel]: The updated UserModel object if found, None otherwise.
         """
         with get_db_session() as session:
-            user = session.query(cls).filter(cls.user_id == user_id).first()
-            if user:
-                user.status = new_status
-                session.commit()
-                return user._to_model()
-            return None
+            previous = select(cls.user_id, cls.status, cls.updated_at).where(
+                cls.user_id == user_id
+            )
+            if expected_status is not None:
+                previous = previous.where(cls.status == expected_status)
+            previous = previous.with_for_update().subquery()
+
+            stmt = (
+                update(cls)
+                .where(cls.user_id == previous.c.user_id)
+                .values(status=new_status)
+                .returning(cls, previous.c.status, previous.c.updated_at)
+                # Refresh an instance the request already loaded into the session
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            row = session.execute(stmt).first()
+            if row is None:
+                return None
+
+            user, old_status, old_updated_at = row
+            new_data = row_data(user)
+            old_data = {**new_data, "status": old_status, "updated_at": old_updated_at}
+            queue_statement_log_events(
+                session, cls.__tablename__, [(user.user_id, old_data, new_data)]
+            )
+            session.commit()
+            return user._to_model()
 
     @classmethod
     def get_employees(cls, organizer_id: int) -> List[UserModel]:
@@ -1,26 +1,37 @@
-import app.logger
 from datetime import datetime
-import fastapi
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from app.database import Base
 from app.models.waiting_list import WaitingListStatus
 from app.logger import logger
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import raiseload, relationship
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.context_manager import get_db_session
+from app.event_listeners import queue_statement_log_events, row_data
+from app.utils.exceptions import CustomBadRequestException
+from app.utils.response_messages import ResponseMessages
 from sqlalchemy import (
     Column,
     Integer,
     String,
     DateTime,
-    Text,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     func,
     asc,
     desc,
-    Boolean,
+    select,
+    update,
+    literal,
+    tuple_,
 )
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+
+# Existing databases get this index from WaitingList.ensure_active_entry_index
+_ACTIVE_ENTRY_INDEX_NAME = "uq_waiting_list_event_date_user_waiting"
+# Arbitrary key of the advisory lock that serialises creating it
+_ACTIVE_ENTRY_INDEX_LOCK_ID = 7_283_104
 
 
 class WaitingList(Base):
@@ -42,79 +53,438 @@ class WaitingList(Base):
     user = relationship("User", back_populates="waiting_list")
     event = relationship("Event", back_populates="waiting_list")
 
+    __table_args__ = (
+        # One active place in the queue per user and event date
+        Index(
+            _ACTIVE_ENTRY_INDEX_NAME,
+            event_date_id,
+            user_id,
+            unique=True,
+            postgresql_where=status == WaitingListStatus.WAITING,
+        ),
+    )
+
     def _to_model(self) -> Dict[str, Any]:
+        # Read loaded values straight from the instance state instead of going
+        # through the instrumented attributes; expired ones still load normally
+        state = self.__dict__
         return {
-            "id": self.id,
-            "event_date_id": self.event_date_id,
-            "event_id": self.event_id,
-            "user_id": self.user_id,
-            "number_of_students": self.number_of_students,
-            "number_of_teachers": self.number_of_teachers,
-            "special_requirements": self.special_requirements,
-            "contact_info": self.contact_info,
-            "created_at": self.created_at,
-            "status": self.status,
-            "position": self.position,  # Add this line
+            key: state[key] if key in state else getattr(self, key)
+            for key in _WAITING_LIST_COLUMNS
         }
 
     @classmethod
-    def add_to_waiting_list(
+    def ensure_active_entry_index(cls, connection: Connection) -> None:
+        """
+        Create the partial unique index behind add_if_event_unlocked's ON CONFLICT.
+
+        create_all never adds indexes to a table that already exists, so
+        databases created before the index was declared are upgraded here.
+        Duplicate waiting entries of a user for one event date would make the
+        index creation fail, so all but the one with the lowest position are
+        cancelled first. Safe to run on every startup and from several
+        workers at once: an advisory lock serialises them and both steps are
+        no-ops once the index exists.
+
+        Args:
+            connection (Connection): A connection inside the transaction to run the DDL in.
+        """
+        index = next(
+            index
+            for index in cls.__table__.indexes
+            if index.name == _ACTIVE_ENTRY_INDEX_NAME
+        )
+        connection.execute(
+            select(func.pg_advisory_xact_lock(_ACTIVE_ENTRY_INDEX_LOCK_ID))
+        )
+        if connection.execute(
+            select(func.to_regclass(_ACTIVE_ENTRY_INDEX_NAME))
+        ).scalar():
+            return
+
+        ranked = (
+            select(
+                cls.id,
+                func.row_number()
+                .over(
+                    partition_by=(cls.event_date_id, cls.user_id),
+                    order_by=(cls.position, cls.id),
+                )
+                .label("rank"),
+            )
+            .where(cls.status == WaitingListStatus.WAITING)
+            .subquery()
+        )
+        cancelled = connection.execute(
+            update(cls)
+            .where(cls.id == ranked.c.id, ranked.c.rank > 1)
+            .values(status=WaitingListStatus.CANCELLED)
+        ).rowcount
+        if cancelled:
+            logger.warning(
+                "Cancelled %s duplicate waiting list entries before creating %s",
+                cancelled,
+                _ACTIVE_ENTRY_INDEX_NAME,
+            )
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+    @classmethod
+    def _raise_event_date_unavailable(cls, db, event_date_id: int):
+        """
+        Raise the error for a conditional write that matched no event date.
+
+        Only runs on the failure path, so the extra lookup is off the hot path.
+        """
+        from app.data_adapter.event import EventDate
+
+        exists = db.execute(
+            select(EventDate.id).where(EventDate.id == event_date_id)
+        ).first()
+        if not exists:
+            logger.warning(f"Event date not found. ID: {event_date_id}")
+            raise CustomBadRequestException(ResponseMessages.ERR_EVENT_DATE_NOT_FOUND)
+        logger.warning(f"Event date is locked. ID: {event_date_id}")
+        raise CustomBadRequestException(ResponseMessages.ERR_EVENT_DATE_LOCKED)
+
+    @classmethod
+    def add_if_event_unlocked(
         cls, waiting_list_entry: Dict[str, Any]
-    ) -> Optional["WaitingList"]:
+    ) -> "WaitingList":
+        """
+        Add an entry with a single INSERT ... SELECT that only matches an
+        unlocked event date, taking event_id and the next position from the
+        same statement. ON CONFLICT DO NOTHING on the active-entry unique
+        index turns a duplicate into an empty result instead of a second query.
+        The statement bypasses the flush listeners, so the audit log row is
+        queued here.
+
+        Args:
+            waiting_list_entry (Dict[str, Any]): The entry data from WaitingListCreateModel.
+
+        Returns:
+            WaitingList: The created entry, detached so it needs no refresh.
+
+        Raises:
+            CustomBadRequestException: If the event date is missing or locked, or the user is already waiting.
+        """
+        from app.data_adapter.event import EventDate
+
+        event_date_id = waiting_list_entry["event_date_id"]
+        db = get_db_session()
         try:
-            with get_db_session() as db:
-                # Get the current highest position for this event date
-                highest_position = (
-                    db.query(func.max(cls.position))
-                    .filter(
-                        cls.event_date_id == waiting_list_entry["event_date_id"],
+            next_position = (
+                select(func.coalesce(func.max(cls.position), 0) + 1)
+                .where(
+                    cls.event_date_id == event_date_id,
+                    cls.status == WaitingListStatus.WAITING,
+                )
+                .scalar_subquery()
+            )
+            columns = [
+                cls.event_date_id,
+                cls.event_id,
+                cls.user_id,
+                cls.number_of_students,
+                cls.number_of_teachers,
+                cls.special_requirements,
+                cls.contact_info,
+                cls.created_at,
+                cls.status,
+                cls.position,
+            ]
+            source = select(
+                EventDate.id,
+                EventDate.event_id,
+                literal(waiting_list_entry["user_id"], cls.user_id.type),
+                literal(
+                    waiting_list_entry["number_of_students"],
+                    cls.number_of_students.type,
+                ),
+                literal(
+                    waiting_list_entry["number_of_teachers"],
+                    cls.number_of_teachers.type,
+                ),
+                literal(
+                    waiting_list_entry.get("special_requirements"),
+                    cls.special_requirements.type,
+                ),
+                literal(waiting_list_entry["contact_info"], cls.contact_info.type),
+                func.timezone("utc", func.now()),
+                literal(WaitingListStatus.WAITING, cls.status.type),
+                next_position,
+            ).where(
+                EventDate.id == event_date_id,
+                EventDate.unlocked_clause(),
+            )
+            stmt = (
+                pg_insert(cls)
+                .from_select(columns, source)
+                .on_conflict_do_nothing(
+                    index_elements=[cls.event_date_id, cls.user_id],
+                    index_where=cls.status == WaitingListStatus.WAITING,
+                )
+                .returning(cls)
+            )
+            new_entry = db.scalars(select(cls).from_statement(stmt)).first()
+            if new_entry is None:
+                already_waiting = db.execute(
+                    select(cls.id).where(
+                        cls.event_date_id == event_date_id,
+                        cls.user_id == waiting_list_entry["user_id"],
                         cls.status == WaitingListStatus.WAITING,
                     )
-                    .scalar()
-                    or 0
-                )
-
-                # Assign the next position
-                waiting_list_entry["position"] = highest_position + 1
+                ).first()
+                if already_waiting:
+                    logger.warning(
+                        f"User {waiting_list_entry['user_id']} is already on the waiting list for event date {event_date_id}"
+                    )
+                    raise CustomBadRequestException(
+                        ResponseMessages.ERR_ALREADY_ON_WAITING_LIST
+                    )
+                cls._raise_event_date_unavailable(db, event_date_id)
 
-                new_entry = cls(**waiting_list_entry)
-                db.add(new_entry)
-                db.commit()
-                db.refresh(new_entry)
-                return new_entry
-        except Exception as e:
-            print(f"Error adding to waiting list: {str(e)}")
+            queue_statement_log_events(
+                db, cls.__tablename__, [(new_entry.id, None, row_data(new_entry))]
+            )
+            db.expunge(new_entry)
+            db.commit()
+            return new_entry
+        except Exception:
+            db.rollback()
             raise
 
     @classmethod
-    def update_status(
-        cls, entry_id: int, new_status: WaitingListStatus
-    ) -> Optional["WaitingList"]:
+    def update_if_event_unlocked(
+        cls, waiting_list_id: int, update_data: Dict[str, Any]
+    ) -> "WaitingList":
+        """
+        Update an entry with a single UPDATE ... FROM event_date that only
+        matches while the entry's event date is unlocked. The statement also
+        returns the previous values from a locked subquery, so the audit log
+        row it would otherwise bypass is queued here.
+
+        Args:
+            waiting_list_id (int): The ID of the entry to update.
+            update_data (Dict[str, Any]): The fields to update; None values are skipped.
+
+        Returns:
+            WaitingList: The updated entry, detached so it needs no refresh.
+
+        Raises:
+            CustomBadRequestException: If the entry or its event date is missing, or the event date is locked.
+        """
+        from app.data_adapter.event import EventDate
+
+        values = {key: value for key, value in update_data.items() if value is not None}
+        db = get_db_session()
         try:
-            with get_db_session() as db:
-                entry = db.query(cls).filter(cls.id == entry_id).first()
-                if entry:
-                    old_status = entry.status
-                    entry.status = new_status
-                    db.commit()
-                    db.refresh(entry)
+            unlocked = EventDate.unlocked_clause()
+            if values:
+                previous = (
+                    select(*(getattr(cls, key) for key in values), cls.id)
+                    .where(cls.id == waiting_list_id)
+                    .with_for_update()
+                    .subquery()
+                )
+                row = db.execute(
+                    update(cls)
+                    .where(
+                        cls.id == previous.c.id,
+                        EventDate.id == cls.event_date_id,
+                        unlocked,
+                    )
+                    .values(**values)
+                    .returning(cls, *(previous.c[key] for key in values))
+                    .execution_options(
+                        synchronize_session=False, populate_existing=True
+                    )
+                ).first()
+                entry = row[0] if row else None
+                if entry is not None:
+                    new_data = row_data(entry)
+                    old_data = {**new_data, **dict(zip(values, row[1:]))}
+                    queue_statement_log_events(
+                        db, cls.__tablename__, [(entry.id, old_data, new_data)]
+                    )
+            else:
+                # Nothing to change, still honour the lock check
+                entry = db.scalars(
+                    select(cls)
+                    .join(EventDate, EventDate.id == cls.event_date_id)
+                    .where(cls.id == waiting_list_id, unlocked)
+                ).first()
+            if entry is None:
+                event_date_id = db.execute(
+                    select(cls.event_date_id).where(cls.id == waiting_list_id)
+                ).scalar()
+                if event_date_id is None:
+                    logger.warning(
+                        f"Waiting list entry not found. ID: {waiting_list_id}"
+                    )
+                    raise CustomBadRequestException(
+                        ResponseMessages.ERR_WAITING_LIST_ENTRY_NOT_FOUND
+                    )
+                cls._raise_event_date_unavailable(db, event_date_id)
 
-                    if (
-                        old_status == WaitingListStatus.WAITING
-                        or new_status == WaitingListStatus.WAITING
-                    ):
-                        cls.reorder_positions(entry.event_date_id)
+            db.expunge(entry)
+            db.commit()
+            if "status" in values:
+                cls.reorder_positions(entry.event_date_id)
+            return entry
+        except Exception:
+            db.rollback()
+            raise
 
-                return entry
+    @classmethod
+    def fetch_eligible_for_processing(
+        cls, event_date_id: int, available_spots: int
+    ) -> List[Any]:
+        """
+        Select the waiting entries that fit into the free spots, in queue order,
+        with a single set-based query.
+
+        The entries are locked with FOR UPDATE SKIP LOCKED inside a CTE; a
+        running SUM(...) OVER (ORDER BY position) then keeps the longest
+        queue prefix whose total stays within available_spots. This matches
+        taking entries in order until the first one that does not fit.
+
+        Args:
+            event_date_id (int): The ID of the event date.
+            available_spots (int): The spots that may be handed out.
+
+        Returns:
+            List[Row]: The eligible entries with their columns plus requested and running_total,
+            ordered by position. The locks are held until the caller commits or rolls back.
+        """
+        try:
+            db = get_db_session()
+            locked = (
+                select(
+                    cls.id,
+                    cls.user_id,
+                    cls.number_of_students,
+                    cls.number_of_teachers,
+                    cls.special_requirements,
+                    cls.contact_info,
+                    cls.position,
+                )
+                .where(
+                    cls.event_date_id == event_date_id,
+                    cls.status == WaitingListStatus.WAITING,
+                )
+                .with_for_update(skip_locked=True)
+                .cte("locked")
+            )
+            requested = locked.c.number_of_students + locked.c.number_of_teachers
+            ranked = select(
+                locked,
+                requested.label("requested"),
+                func.sum(requested)
+                .over(order_by=(locked.c.position, locked.c.id))
+                .label("running_total"),
+            ).cte("ranked")
+            return db.execute(
+                select(ranked)
+                .where(ranked.c.running_total <= available_spots)
+                .order_by(ranked.c.position, ranked.c.id)
+            ).all()
         except Exception as e:
-            print(f"Error updating waiting list entry status: {str(e)}")
+            logger.error(f"Error selecting waiting entries to process: {str(e)}")
             raise
 
     @classmethod
-    def get_user_waiting_list_entries(cls, user_id: int) -> List["WaitingList"]:
+    def bulk_update_status(
+        cls, event_date_id: int, ids: List[int], new_status: WaitingListStatus
+    ) -> int:
+        """
+        Set the status of several entries with one UPDATE ... WHERE id IN (...)
+        and renumber the remaining queue with one more UPDATE.
+
+        The statements are not committed so they can share a transaction with
+        the caller's other writes. Both return the previous values from a
+        subquery, so the audit log rows of every changed entry are queued
+        without extra queries.
+
+        Args:
+            event_date_id (int): The ID of the event date the entries belong to.
+            ids (List[int]): The IDs of the entries to update.
+            new_status (WaitingListStatus): The status to set.
+
+        Returns:
+            int: The number of entries updated.
+        """
+        if not ids:
+            return 0
+        db = get_db_session()
+        previous = (
+            select(cls.id, cls.status).where(cls.id.in_(ids)).with_for_update()
+        ).subquery()
+        updated = db.execute(
+            update(cls)
+            .where(cls.id == previous.c.id)
+            .values(status=new_status)
+            .returning(cls, previous.c.status)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
+        changes = []
+        for entry, old_status in updated:
+            new_data = row_data(entry)
+            changes.append((entry.id, {**new_data, "status": old_status}, new_data))
+
+        ranked = (
+            select(
+                cls.id,
+                cls.position,
+                func.row_number().over(order_by=cls.position).label("new_position"),
+            )
+            .where(
+                cls.event_date_id == event_date_id,
+                cls.status == WaitingListStatus.WAITING,
+            )
+            .subquery()
+        )
+        # Only entries whose position actually moves are rewritten
+        renumbered = db.execute(
+            update(cls)
+            .where(cls.id == ranked.c.id, cls.position != ranked.c.new_position)
+            .values(position=ranked.c.new_position)
+            .returning(cls, ranked.c.position)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
+        for entry, old_position in renumbered:
+            new_data = row_data(entry)
+            changes.append((entry.id, {**new_data, "position": old_position}, new_data))
+
+        queue_statement_log_events(db, cls.__tablename__, changes)
+        return len(updated)
+
+    @classmethod
+    def iter_user_waiting_list_entries(
+        cls, user_id: int, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a user's waiting list entries without loading them all at once.
+
+        Rows are fetched from a server-side cursor in batches of batch_size and
+        converted as they arrive, so the ORM objects never pile up in a list.
+
+        Args:
+            user_id (int): The ID of the user.
+            batch_size (int): The number of rows fetched per round-trip.
+
+        Yields:
+            Dict[str, Any]: The entries as returned by _to_model().
+        """
         try:
-            with get_db_session() as db:
-                return db.query(cls).filter(cls.user_id == user_id).all()
+            db = get_db_session()
+            query = (
+                db.query(cls)
+                .options(raiseload("*"))
+                .filter(cls.user_id == user_id)
+                .order_by(cls.created_at, cls.id)
+            )
+            for entry in query.yield_per(batch_size):
+                yield entry._to_model()
         except Exception as e:
             logger.error(f"Error retrieving user waiting list entries: {str(e)}")
             raise
@@ -169,8 +539,11 @@ class WaitingList(Base):
                     entry.position = i
 
                 db.commit()
-        except Exception as e:
-            print(f"Error reordering waiting list positions: {str(e)}")
+        except Exception:
+            logger.exception(
+                "Error reordering waiting list positions for event date ID: %s",
+                event_date_id,
+            )
             raise
 
     @classmethod
@@ -181,25 +554,39 @@ class WaitingList(Base):
         items_per_page: int,
         filter_params: Optional[Dict[str, Union[str, List[str]]]],
         sorting_params: Optional[List[Dict[str, str]]],
-    ) -> Tuple[List["WaitingList"], int]:
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List["WaitingList"], Optional[int], Optional[Tuple[datetime, int]]]:
         """
         Retrieve the waiting list for a specific event date with pagination, filtering, and sorting.
 
+        The total count is read from a COUNT(*) OVER () column of the page
+        query itself. Without sorting_params the entries are in queue order,
+        (created_at, id) ascending, and a keyset cursor can be passed instead
+        of a page number; that path skips the count.
+
         Args:
             event_date_id (int): The ID of the event date.
-            current_page (int): The current page number.
+            current_page (int): The current page number, ignored when a cursor is given.
             items_per_page (int): The number of items per page.
             filter_params (Optional[Dict[str, Union[str, List[str]]]]): The filter parameters.
             sorting_params (Optional[List[Dict[str, str]]]): The sorting parameters.
+            cursor (Optional[Tuple[datetime, int]]): The (created_at, id) of the last entry of the previous page.
 
         Returns:
-            Tuple[List['WaitingList'], int]: A tuple containing the list of WaitingList objects and the total count.
+            Tuple[List['WaitingList'], Optional[int], Optional[Tuple[datetime, int]]]: The WaitingList objects,
+            the total count (None with a cursor) and the keyset position of the next page.
         """
         try:
             with get_db_session() as db:
-                query = db.query(cls).filter(
-                    cls.event_date_id == event_date_id,
-                    cls.status == WaitingListStatus.WAITING,
+                # _to_model() only reads columns; refuse lazy loads so a page
+                # never degrades into one extra query per row
+                query = (
+                    db.query(cls)
+                    .options(raiseload("*"))
+                    .filter(
+                        cls.event_date_id == event_date_id,
+                        cls.status == WaitingListStatus.WAITING,
+                    )
                 )
 
                 # Apply filters
@@ -220,19 +607,48 @@ class WaitingList(Base):
                                     query = query.order_by(desc(getattr(cls, key)))
                                 else:
                                     query = query.order_by(asc(getattr(cls, key)))
+                else:
+                    query = query.order_by(cls.created_at, cls.id)
 
-                # Get total count
-                total_count = query.count()
+                if cursor and not sorting_params:
+                    # Keyset pagination over (created_at, id)
+                    entries = (
+                        query.filter(tuple_(cls.created_at, cls.id) > tuple_(*cursor))
+                        .limit(items_per_page + 1)
+                        .all()
+                    )
+                    next_position = None
+                    if len(entries) > items_per_page:
+                        entries = entries[:items_per_page]
+                        next_position = (entries[-1].created_at, entries[-1].id)
+                    return entries, None, next_position
 
-                # Apply pagination
-                query = query.offset((current_page - 1) * items_per_page).limit(
-                    items_per_page
+                # Total count travels with every row of the page
+                rows = (
+                    query.add_columns(func.count().over().label("total_count"))
+                    .offset((current_page - 1) * items_per_page)
+                    .limit(items_per_page)
+                    .all()
                 )
+                if rows:
+                    total_count = rows[0].total_count
+                elif current_page > 1:
+                    # Past the last page the window has no rows to report on
+                    total_count = query.order_by(None).count()
+                else:
+                    total_count = 0
 
-                # Execute query
-                waiting_list_entries = query.all()
+                waiting_list_entries = [row[0] for row in rows]
+                next_position = None
+                if (
+                    not sorting_params
+                    and waiting_list_entries
+                    and current_page * items_per_page < total_count
+                ):
+                    last = waiting_list_entries[-1]
+                    next_position = (last.created_at, last.id)
 
-                return waiting_list_entries, total_count
+                return waiting_list_entries, total_count, next_position
 
         except Exception as e:
             logger.error(
@@ -260,9 +676,11 @@ class WaitingList(Base):
     @classmethod
     def get_by_id(cls, waiting_list_id: int) -> Optional["WaitingList"]:
         try:
-            print("WaitingList.get_by_id", waiting_list_id)
             with get_db_session() as db:
                 return db.query(cls).filter(cls.id == waiting_list_id).first()
         except Exception as e:
             logger.error(f"Error retrieving waiting list entry by ID: {str(e)}")
             raise
+
+
+_WAITING_LIST_COLUMNS = tuple(column.key for column in WaitingList.__table__.columns)
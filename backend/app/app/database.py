@@ -21,6 +21,9 @@ def create_new_engine(uri: str):
         pool_size=30,
         max_overflow=50,
         pool_recycle=900,
+        # Reuse the most recently returned connection so bursts stay on a warm
+        # subset and idle connections age out through pool_recycle
+        pool_use_lifo=True,
     )
 
     # Attach event listeners to handle process-based disconnections
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Generator, Optional, Type
 
 import bcrypt
+import jwt
 from app.core.config import settings
 from app.database import Base, SessionLocal
 from app.logger import logger
@@ -11,8 +12,6 @@ from app.models.user import UserTokenData
 from app.utils.exceptions import CustomAuthException
 from fastapi import Depends
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer
-from jose import jwt
-from jose.exceptions import JWTError
 from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.orm import Session
@@ -110,13 +109,19 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def authenticate_user_token(token: str = Depends(oauth2_user_scheme)):
+async def authenticate_user_token(
+    token: str = Depends(oauth2_user_scheme),
+) -> UserTokenData:
     """
     Decode the access token and set the user data in the context.
 
     Args:
         token (str): JWT access token.
 
+    Returns:
+        UserTokenData: The authenticated actor, so endpoints can pass it on
+        without reading the context variable again.
+
     Raises:
         CustomAuthException: If token is invalid or decoding fails.
     """
@@ -124,11 +129,14 @@ async def authenticate_user_token(token: str = Depends(oauth2_user_scheme)):
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        context_actor_user_data.set(UserTokenData(**payload))
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         logger.info(f"Error while decoding access token: {e}")
         raise CustomAuthException()
 
+    actor = UserTokenData(**payload)
+    context_actor_user_data.set(actor)
+    return actor
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -2,9 +2,10 @@ from collections import defaultdict
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+from typing import Iterable
 
 from app.data_adapter.log import Log
-from app.database import Base, SessionLocal
+from app.database import Base
 from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import get_history
@@ -59,26 +60,66 @@ def queue_log_event(
     )
 
 
+def row_data(instance: Base) -> dict:
+    """Return the mapped column values of an instance, as the listeners log them."""
+    return {
+        key: getattr(instance, key) for key in inspect(instance).mapper.columns.keys()
+    }
+
+
+def queue_statement_log_events(
+    session: Session,
+    table: str,
+    changes: Iterable[tuple[int, dict | None, dict | None]],
+) -> None:
+    """
+    Queue log events for rows written by Core INSERT/UPDATE statements.
+
+    Bulk and RETURNING statements bypass the unit of work, so the flush
+    listeners never see their rows. Callers report the changes here instead
+    and the log rows are written by the same before_commit hook, in the
+    transaction that made the changes.
+
+    Args:
+        session (Session): The session that executed the statement.
+        table (str): The name of the table that was written.
+        changes (Iterable[tuple[int, dict | None, dict | None]]): The
+            (primary key, old data, new data) of every affected row.
+    """
+    from app.context_manager import context_actor_user_data
+
+    actor = context_actor_user_data.get()
+    user_id = actor.user_id if actor else None
+    for table_primary_key, old_data, new_data in changes:
+        queue_log_event(session, table, table_primary_key, old_data, new_data, user_id)
+
+
 def commit_log_events(session):
     """
-    Commit the log events stored in the session.
+    Add the log events stored in the session to its current transaction.
+
+    Pending changes are flushed first so their events are queued, then the
+    log rows are flushed through the same session. They are committed by
+    the commit that is already under way, in one round trip with the
+    changes they describe. A session that queued nothing, such as one that
+    only served reads, issues no extra statements.
 
     :param session: SQLAlchemy session to use
     """
-    # Check if log entries exist in the session
-    if hasattr(session, "log_entries"):
-        # Iterate over the log events
-        for (
-            table,
-            table_primary_key,
-            old_data,
-            new_data,
-            user_id,
-        ) in session.log_entries["events"]:
-            # Log each event using a separate session
-            log_event(table, table_primary_key, old_data, new_data, user_id)
-        # Clear the log entries after committing
-        session.log_entries.clear()
+    session.flush()
+    log_entries = getattr(session, "log_entries", None)
+    if not log_entries or not log_entries["events"]:
+        return
+
+    entries = [
+        entry
+        for entry in (build_log_entry(*event) for event in log_entries["events"])
+        if entry is not None
+    ]
+    log_entries.clear()
+    if entries:
+        session.add_all(entries)
+        session.flush()
 
 
 def find_diff_keys(old_data: dict, new_data: dict) -> tuple[dict, dict]:
@@ -118,15 +159,15 @@ def find_diff_keys(old_data: dict, new_data: dict) -> tuple[dict, dict]:
     return old_diff, new_diff
 
 
-def log_event(
+def build_log_entry(
     table: str,
     table_primary_key: int,
     old_data: dict | None,
     new_data: dict | None,
     user_id: int | None,
-) -> None:
+) -> Log | None:
     """
-    Logs changes made to a table in the database.
+    Build the log row for a change made to a table in the database.
 
     Args:
         table (str): The name of the table where the change occurred.
@@ -135,6 +176,9 @@ def log_event(
         old_data (dict | None): The old data before the change.
         new_data (dict | None): The new data after the change.
         user_id (int | None): The user ID of the user who made the change.
+
+    Returns:
+        Log | None: The log row, or None if there is no data to log.
     """
     # Calculate the difference between old and new data
     old_diff, new_diff = {}, {}
@@ -151,17 +195,15 @@ def log_event(
     serialized_new_data = serialize_data(new_diff) if new_diff else None
 
     # Log only if there is a difference
-    if serialized_old_data or serialized_new_data:
-        with SessionLocal() as log_session:
-            log_entry = Log(
-                user_id=user_id,
-                table_name=table,
-                table_primary_key=table_primary_key,
-                old_data=serialized_old_data,
-                new_data=serialized_new_data,
-            )
-            log_session.add(log_entry)
-            log_session.commit()  # Ensure the log entry is committed
+    if not (serialized_old_data or serialized_new_data):
+        return None
+    return Log(
+        user_id=user_id,
+        table_name=table,
+        table_primary_key=table_primary_key,
+        old_data=serialized_old_data,
+        new_data=serialized_new_data,
+    )
 
 
 def receive_before_flush(session, flush_context, instances):
@@ -287,16 +329,17 @@ def receive_after_flush(session, flush_context):
     session_info["original_data"].clear()
 
 
-def receive_after_commit(session):
+def receive_before_commit(session):
     """
-    Listener function that runs after a session is committed.
+    Listener function that runs before a session is committed.
 
-    It commits the log events stored in the session.
+    It writes the log events stored in the session as part of the
+    transaction being committed.
 
     Args:
         session (Session): The SQLAlchemy session object.
     """
-    # Commit the log events stored in the session
+    # Write the log events stored in the session
     commit_log_events(session)
 
 
@@ -347,7 +390,7 @@ def register_event_listeners():
     The registered event listeners are:
     - before_flush: Runs before the session is flushed.
     - after_flush: Runs after the session is flushed.
-    - after_commit: Runs after the session is committed.
+    - before_commit: Runs before the session is committed.
     - persistent_to_deleted: Runs when a persistent instance is deleted.
     """
     global _event_listeners_registered
@@ -357,8 +400,8 @@ def register_event_listeners():
         event.listen(Session, "before_flush", receive_before_flush)
         # Register the event listener for after the session is flushed
         event.listen(Session, "after_flush", receive_after_flush)
-        # Register the event listener for after the session is committed
-        event.listen(Session, "after_commit", receive_after_commit)
+        # Register the event listener for before the session is committed
+        event.listen(Session, "before_commit", receive_before_commit)
         # Register the event listener for when a persistent instance is deleted
         event.listen(Session, "persistent_to_deleted", receive_persistent_to_deleted)
         # Set the flag to indicate that the event listeners are registered
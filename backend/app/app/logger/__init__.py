@@ -1,7 +1,19 @@
 import logging
+from contextvars import ContextVar
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 
+# Correlation ID of the request being handled, stamped on every log record
+context_request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """Expose the current request ID to formatters as %(request_id)s."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = context_request_id.get()
+        return True
+
 
 def get_logger(name, level=logging.DEBUG) -> logging.Logger:
     """Logging setup with TimedRotatingFileHandler."""
@@ -27,10 +39,11 @@ def get_logger(name, level=logging.DEBUG) -> logging.Logger:
         )
         log_handler.setFormatter(
             logging.Formatter(
-                "%(asctime)s loglevel=%(levelname)-6s logger=%(name)-25s %(funcName)s() L%(lineno)-4d %(message)s",
+                "%(asctime)s loglevel=%(levelname)-6s logger=%(name)-25s request=%(request_id)s %(funcName)s() L%(lineno)-4d %(message)s",
                 datefmt="%Y-%m-%d %H:%M:%S",
             )
         )
+        log_handler.addFilter(RequestIdFilter())
         logger_instance.addHandler(log_handler)
 
     logger_instance.setLevel(level)
@@ -1,3 +1,7 @@
+import hashlib
+from functools import lru_cache
+
+import orjson
 from app.api.v1.api import api_router as api_router_v1
 from app.context_manager import context_id_api, context_set_db_session_rollback
 from app.core.config import settings
@@ -5,8 +9,10 @@ from app.database import Base, engine
 from app.data_adapter.report import Report
 from app.data_adapter.event import Event
 from app.data_adapter.reservation import Reservation
+from app.data_adapter.waiting_list import WaitingList
 from app.event_listeners import register_event_listeners
 from app.logger import logger
+from app.service.waiting_list_processor import waiting_list_processor
 from app.models.response import GenericResponseModel, build_api_response
 from app.utils.exceptions import (
     CustomAuthException,
@@ -14,14 +20,14 @@ from app.utils.exceptions import (
     CustomInternalServerErrorException,
     CustomValidationException,
 )
-from app.utils.middleware import CombinedAuthMiddleware, CombinedDBSessionMiddleware
+from app.utils.middleware import CombinedRequestMiddleware
 from app.utils.response_messages import ResponseMessages
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.responses import Response
@@ -31,17 +37,34 @@ print("DEBUG: Drop all tables:")
 # Base.metadata.drop_all(bind=engine)
 print("DEBUG: Create all tables:")
 Base.metadata.create_all(bind=engine)
+# create_all skips indexes on tables that already exist
+with engine.begin() as connection:
+    WaitingList.ensure_active_entry_index(connection)
 
 # Initialize FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.API_VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
+
+@app.on_event("startup")
+async def start_waiting_list_processor() -> None:
+    """Start coalescing waiting list processing in the background."""
+    if settings.WAITING_LIST_AUTO_PROCESS:
+        await waiting_list_processor.start()
+
+
+@app.on_event("shutdown")
+async def stop_waiting_list_processor() -> None:
+    """Stop the background waiting list processor."""
+    await waiting_list_processor.stop()
+
+
 # Add middlewares
-app.add_middleware(CombinedDBSessionMiddleware)
-app.add_middleware(CombinedAuthMiddleware)
+app.add_middleware(CombinedRequestMiddleware)
 app.add_middleware(TrustedHostMiddleware)
 
 # Add CORS middleware if needed
@@ -68,10 +91,22 @@ async def get_swagger_documentation() -> HTMLResponse:
     return get_swagger_ui_html(openapi_url="/api/openapi.json", title="docs")
 
 
+@lru_cache(maxsize=1)
+def _openapi_document() -> tuple[bytes, str]:
+    """Return the encoded OpenAPI schema and its ETag; routes are fixed at startup."""
+    body = orjson.dumps(get_openapi(title="FastAPI", version="1.0", routes=app.routes))
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
 @app.get("/api/openapi.json", tags=["documentation"], include_in_schema=False)
-async def openapi() -> dict:
+async def openapi(request: Request) -> Response:
     """Generate the OpenAPI JSON."""
-    return get_openapi(title="FastAPI", version="1.0", routes=app.routes)
+    body, etag = _openapi_document()
+    # The docs UI revalidates on every load; an unchanged schema costs a 304
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/redoc", tags=["documentation"], include_in_schema=False)
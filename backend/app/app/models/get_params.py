@@ -1,6 +1,8 @@
+import base64
+import binascii
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Type, Union
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 from app.dependencies import get_base_table_columns
 from fastapi import HTTPException
@@ -29,6 +31,21 @@ def parse_json_params(
         raise HTTPException(status_code=400, detail=f"Invalid parameters: {e}")
 
 
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor back to (created_at, id)."""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, json.JSONDecodeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
 def validate_column_type(column: InstrumentedAttribute, value: str, is_nullable: bool):
     column_type = column.type
 
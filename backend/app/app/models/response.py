@@ -7,6 +7,7 @@ from fastapi import status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticSerializationError
 
 # Define a type variable that can be any type
 DataT = TypeVar("DataT")
@@ -17,9 +18,11 @@ class PaginationResponseDataModel(BaseModel, Generic[DataT]):
 
     current_page: int
     items_per_page: int
-    total_pages: int
-    total_items: int
+    total_pages: Optional[int]
+    total_items: Optional[int]
     items: Optional[DataT]
+    has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
 
 
 class GenericResponseModel(BaseModel, Generic[DataT]):
@@ -69,7 +72,24 @@ def build_api_response(
             "unread_notification", False
         )
 
-        response_json = jsonable_encoder(generic_response)
+        if generic_response.data is None:
+            # Message-only envelopes (errors, deletes, ...) hold nothing but
+            # str/int/bool/None, so orjson encodes them without a pydantic pass
+            response_json = {
+                "api_id": generic_response.api_id,
+                "error": generic_response.error,
+                "message": generic_response.message,
+                "data": None,
+                "status_code": generic_response.status_code,
+                "unread_notification": generic_response.unread_notification,
+            }
+        else:
+            # Serialize in pydantic-core and let orjson encode the result; fall
+            # back to jsonable_encoder for payloads pydantic cannot serialize
+            try:
+                response_json = generic_response.model_dump(mode="json")
+            except PydanticSerializationError:
+                response_json = jsonable_encoder(generic_response)
         res = ORJSONResponse(
             status_code=generic_response.status_code,
             content=response_json,
@@ -361,16 +361,15 @@ class EventService:
     @staticmethod
     def get_event_date_by_id(event_date_id: int) -> GenericResponseModel:
         try:
-            event_date = EventDate.get_event_date_by_id(event_date_id)
+            event_date_dict = EventDate.get_event_date_by_id(event_date_id)
 
-            if not event_date:
+            if not event_date_dict:
                 logger.warning(f"Event date not found. ID: {event_date_id}")
                 raise CustomBadRequestException(
                     ResponseMessages.ERR_EVENT_DATE_NOT_FOUND
                 )
 
             logger.info(f"Event date retrieved successfully. ID: {event_date_id}")
-            event_date_dict = event_date._to_model()
 
             # Convert datetime to date and time
             if isinstance(event_date_dict["date"], datetime):
@@ -429,7 +428,7 @@ class EventService:
             )
         except Exception as e:
             logger.error(f"Error creating claim: {str(e)}")
-            raise CustomBadRequestException(ResponseMessages.ERR_CREATING_CLAIM)
+            raise CustomBadRequestException(ResponseMessages.ERR_CREATE_CLAIM)
 
     @staticmethod
     async def get_pending_claims() -> GenericResponseModel:
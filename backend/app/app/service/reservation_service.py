@@ -26,6 +26,8 @@ from app.data_adapter.email_log import EmailLog, EmailLogStatus
 from app.models.email_log import EmailLogTemplates, EmailLogTypes, EmailLogLanguage
 from app.service.email_service import EmailService
 from app.data_adapter.user import User
+from app.service.waiting_list_processor import waiting_list_processor
+from app.core.config import settings
 
 class ReservationService:
 
@@ -172,6 +174,9 @@ class ReservationService:
         logger.info(
             f"user_id={context_actor_user_data.get().user_id} deleted reservation: {reservation_id}"
         )
+        # Freed spots may admit entries from the waiting list
+        if settings.WAITING_LIST_AUTO_PROCESS:
+            waiting_list_processor.schedule(result["event_date_id"])
         return GenericResponseModel(
             api_id=context_id_api.get(),
             message=ResponseMessages.MSG_SUCCESS_DELETE_RESERVATION,
@@ -539,6 +544,8 @@ class ReservationService:
         """
         try:
             updated_reservation = Reservation.reject_reservation(reservation_id)
+            if settings.WAITING_LIST_AUTO_PROCESS:
+                waiting_list_processor.schedule(updated_reservation["event_date_id"])
 
             return GenericResponseModel(
                 api_id=context_id_api.get(),
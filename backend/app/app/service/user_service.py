@@ -1,13 +1,18 @@
 import json
-import math
-from datetime import datetime, timedelta
+import orjson
+from datetime import datetime, timezone
 import os
-import typing
 
-from app.context_manager import context_actor_user_data, context_id_api
+from app.context_manager import (
+    context_actor_user_data,
+    context_id_api,
+    run_with_own_session,
+)
+from app.database import SessionLocal
 from app.data_adapter.notification import Notification
 from app.data_adapter.user import User
 from app.logger import logger
+from app.models.get_params import decode_cursor, encode_cursor
 from app.models.notification import NotificationType
 from app.models.response import GenericResponseModel, PaginationResponseDataModel
 from app.models.user import (
@@ -15,6 +20,7 @@ from app.models.user import (
     UserModel,
     UserRole,
     UserStatus,
+    UserTokenData,
     UserUpdateModel,
 )
 from app.utils.exceptions import (
@@ -24,24 +30,27 @@ from app.utils.exceptions import (
 )
 from app.utils.response_messages import ResponseMessages
 from fastapi import status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from app.data_adapter.school import School
-from typing import Any, List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional
 from app.data_adapter.email_log import EmailLog, EmailLogStatus
 from app.models.email_log import EmailLogTemplates, EmailLogTypes, EmailLogLanguage
 from app.service.email_service import EmailService
+from app.core.redis_client import redis_client
+from redis.exceptions import RedisError
+from sqlalchemy.exc import IntegrityError
+
+LOCKOUT_COUNTER_KEY_PREFIX = "lockout:"
+LOCK_KEY_PREFIX = "lock:"
+LOCKOUT_COUNTER_TTL_SECONDS = 900
+
+USER_CREATED_NOTIFICATION_TEMPLATE = "Uživatel {} {} byl úspěšně vytvořen".format
 
 
 class UserService:
     @staticmethod
-    async def create_user(user_data: UserCreateModel, background_tasks: BackgroundTasks,) -> GenericResponseModel:
+    def create_user(user_data: UserCreateModel, background_tasks: BackgroundTasks,) -> GenericResponseModel:
         try:
-            # Check if the email is already taken
-            existing_user = User.get_user_by_email(user_data.user_email)
-            if existing_user:
-                raise CustomBadRequestException(
-                    ResponseMessages.ERR_EMAIL_ALREADY_TAKEN
-                )
-
             # Handle school representative case
             if user_data.role == UserRole.SCHOOL_REPRESENTATIVE:
                 if not user_data.school:
@@ -49,9 +58,17 @@ class UserService:
                         ResponseMessages.ERR_MISSING_SCHOOL_DATA
                     )
 
-                # Check if the school already exists
-                existing_school = School.get_school_by_ico(user_data.school.ico)
-                if existing_school:
+                # The school is committed before the user, so check email and
+                # school availability up front in a single round-trip
+                existing_user_id, existing_school_id = User.preflight_create(
+                    user_data.user_email, user_data.school.ico
+                )
+                if existing_user_id:
+                    raise CustomBadRequestException(
+                        ResponseMessages.ERR_EMAIL_ALREADY_TAKEN
+                    )
+
+                if existing_school_id:
                     raise CustomBadRequestException(
                         ResponseMessages.ERR_SCHOOL_ALREADY_REGISTERED
                     )
@@ -60,12 +77,21 @@ class UserService:
                 school = School.create_new_school(user_data.school)
                 user_data.school_id = school.id
 
-            # Create a new user
-            new_user = User.create_new_user(user_data)
+            # Create a new user, relying on the unique user_email constraint
+            try:
+                new_user = User.create_new_user(user_data)
+            except IntegrityError as e:
+                if User.is_email_conflict(e):
+                    raise CustomBadRequestException(
+                        ResponseMessages.ERR_EMAIL_ALREADY_TAKEN
+                    )
+                raise
 
-            # Create a new notification
-            Notification.create_notification(
-                f"Uživatel {new_user.first_name} {new_user.last_name} byl úspěšně vytvořen",
+            # Create a new notification after the response has been sent
+            background_tasks.add_task(
+                run_with_own_session,
+                Notification.create_notification,
+                USER_CREATED_NOTIFICATION_TEMPLATE(new_user.first_name, new_user.last_name),
                 datetime.now().date(),
                 NotificationType.INFO,
                 [new_user.user_id],
@@ -140,6 +166,7 @@ class UserService:
         items_per_page: int,
         filter_params: Optional[List[Dict[str, str]]],
         sorting_params: Optional[List[Dict[str, str]]],
+        with_count: bool = True,
     ) -> GenericResponseModel:
         """
         Get all users.
@@ -148,23 +175,23 @@ class UserService:
             current_page (int): The current page number.
             items_per_page (int): The number of items per page.
             filters (dict): The filters to apply.
+            with_count (bool): Whether to compute total_items and total_pages.
 
         Returns:
             GenericResponseModel: A GenericResponseModel with the list of users or an error.
         """
-        # Check if the user is authenticated
-        if not context_actor_user_data.get():
-            raise CustomBadRequestException(ResponseMessages.ERR_USER_NOT_FOUND)
-
         # Get all users
-        users, total_items = User.get_users(
+        users, total_items, has_next = User.get_users(
             current_page,
             items_per_page,
             filter_params,
             sorting_params,
+            with_count,
         )
 
-        total_pages = math.ceil(total_items / items_per_page)
+        total_pages = (
+            -(-total_items // items_per_page) if total_items is not None else None
+        )
 
         # Return a GenericResponseModel with the list of users
         return GenericResponseModel(
@@ -177,33 +204,67 @@ class UserService:
                 total_pages=total_pages,
                 total_items=total_items,
                 items=users,
+                has_next=has_next,
             ),
         )
 
+    @staticmethod
+    def export_users(
+        filter_params: Optional[List[Dict[str, str]]],
+        sorting_params: Optional[List[Dict[str, str]]],
+    ) -> StreamingResponse:
+        """
+        Export all users matching the filters as newline-delimited JSON.
+
+        The response is streamed from a dedicated session, which is closed once the
+        last row has been sent. Password hashes are not exported.
+
+        Args:
+            filter_params (Optional[List[Dict[str, str]]]): The filters to apply.
+            sorting_params (Optional[List[Dict[str, str]]]): The sorting parameters to apply.
+
+        Returns:
+            StreamingResponse: The users, one JSON object per line.
+        """
+
+        def stream_users() -> Iterator[bytes]:
+            db = SessionLocal()
+            try:
+                for user in User.iter_users(db, filter_params, sorting_params):
+                    yield orjson.dumps(
+                        user.model_dump(mode="json", exclude={"password_hash"})
+                    ) + b"\n"
+            finally:
+                db.close()
+
+        return StreamingResponse(
+            stream_users(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=users.ndjson"},
+        )
+
     @staticmethod
     def delete_user(
-        user_id: int,  # The ID of the user deleting another user.
+        user_id: int,  # The ID of the user to be deleted.
+        actor: UserTokenData,  # The authenticated user deleting the user.
     ) -> GenericResponseModel:  # The response containing the result of the operation.
         """
         Delete a user by ID.
 
         Args:
             user_id (int): The ID of the user to be deleted.
+            actor (UserTokenData): The authenticated user performing the deletion.
 
         Returns:
             GenericResponseModel: The response containing the result of the operation.
         """
-        # Check if the user deleting another user is authenticated
-        if not context_actor_user_data.get():
-            raise CustomInternalServerErrorException()
-
         # Get the user deleting another user
         user = User.delete_user_by_id(user_id)
         if not user:
             raise CustomBadRequestException(ResponseMessages.ERR_USER_NOT_FOUND)
 
         # Log the successful deletion of the user
-        logger.info(f"User ID {user_id} deleted user ID {user_id} successfully, user_id={context_actor_user_data.get().user_id}")
+        logger.info(f"User ID {actor.user_id} deleted user ID {user_id} successfully")
 
         return GenericResponseModel(
             api_id=context_id_api.get(),  # The ID of the API
@@ -214,8 +275,9 @@ class UserService:
 
     @staticmethod
     def update_user(
-        user_id: int,  # The ID of the user updating another user.
+        user_id: int,  # The ID of the user to be updated.
         user_data: UserUpdateModel,  # The updated user data.
+        actor: UserTokenData,  # The authenticated user performing the update.
     ) -> GenericResponseModel:  # The response containing the result of the operation.
         """
         Update a user by ID.
@@ -223,20 +285,19 @@ class UserService:
         Args:
             user_id (int): The ID of the user to be updated.
             user_data (UserUpdateModel): The updated user data.
+            actor (UserTokenData): The authenticated user performing the update.
 
         Returns:
             GenericResponseModel: The response containing the result of the operation.
         """
-        # Check if the user is authenticated
-        if not context_actor_user_data.get():
-            raise CustomInternalServerErrorException()
-
-        if not User.get_user_by_id(user_id):
+        # Check the user exists and the email is free in a single round-trip
+        user_exists, email_owner_id = User.preflight_update(
+            user_id, user_data.user_email
+        )
+        if not user_exists:
             raise CustomBadRequestException(ResponseMessages.ERR_USER_NOT_FOUND)
 
-        # Check if the email is already taken
-        existing_user = User.get_user_by_email(user_data.user_email)
-        if existing_user and existing_user.user_id != user_id:
+        if email_owner_id and email_owner_id != user_id:
             raise CustomBadRequestException(ResponseMessages.ERR_EMAIL_ALREADY_TAKEN)
 
         # Perform the user update
@@ -250,7 +311,7 @@ class UserService:
             raise CustomInternalServerErrorException()
 
         # Log the successful update of the user
-        logger.info(f"Successfully updated user ID {user_id}, user_id={context_actor_user_data.get().user_id}")
+        logger.info(f"Successfully updated user ID {user_id}, user_id={actor.user_id}")
         return GenericResponseModel(
             api_id=context_id_api.get(),
             message=ResponseMessages.MSG_SUCCESS_UPDATE_USER,
@@ -261,12 +322,14 @@ class UserService:
     @staticmethod
     def get_user_by_id(
         user_id: int,  # The ID of the user to retrieve.
+        actor: UserTokenData,  # The authenticated user requesting the user.
     ) -> UserModel:  # The retrieved user.
         """
         Get a user by ID.
 
         Args:
             user_id (int): The ID of the user to retrieve.
+            actor (UserTokenData): The authenticated user requesting the user.
 
         Returns:
             UserModel: The retrieved user.
@@ -282,7 +345,7 @@ class UserService:
             raise CustomBadRequestException(ResponseMessages.ERR_USER_NOT_FOUND)
 
         # Log the successful retrieval of the user
-        logger.info(f"Successfully retrieved user ID {user_id}, user_id={context_actor_user_data.get().user_id}")
+        logger.info(f"Successfully retrieved user ID {user_id}, user_id={actor.user_id}")
 
         # Return the user
         return GenericResponseModel(
@@ -297,35 +360,84 @@ class UserService:
         """
         Check if the user account is locked and raise an exception if it is.
 
+        The lock is read from Redis; the DB columns are only consulted when Redis
+        is unavailable.
+
         Args:
             user (User): The user to check.
 
         Raises:
             CustomAccountLockedException: If the account is locked.
         """
-        is_locked, unlock_time = user.is_account_locked()
-        if is_locked:
-            raise CustomAccountLockedException(unlock_time)
+        try:
+            unlock_timestamp = redis_client.get(f"{LOCK_KEY_PREFIX}{user.user_id}")
+        except RedisError as e:
+            logger.warning(f"Redis unavailable, checking account lock in DB: {e}")
+            is_locked, unlock_time = user.is_account_locked()
+            if is_locked:
+                raise CustomAccountLockedException(unlock_time)
+            return
+
+        if unlock_timestamp:
+            raise CustomAccountLockedException(
+                datetime.fromtimestamp(float(unlock_timestamp), tz=timezone.utc)
+            )
 
     @staticmethod
-    def handle_failed_login(user: User) -> None:
+    def handle_failed_login(user: User, background_tasks: BackgroundTasks) -> None:
         """
         Handle a failed login attempt.
 
+        The attempt is counted in Redis and the account is locked there once the
+        limit is reached. The DB columns are updated in a background task as an
+        audit record.
+
         Args:
             user (User): The user who failed to log in.
+            background_tasks (BackgroundTasks): The request background tasks.
         """
-        User.handle_failed_login(user.user_id)
+        counter_key = f"{LOCKOUT_COUNTER_KEY_PREFIX}{user.user_id}"
+        try:
+            pipeline = redis_client.pipeline()
+            pipeline.incr(counter_key)
+            pipeline.expire(counter_key, LOCKOUT_COUNTER_TTL_SECONDS)
+            failed_attempts, _ = pipeline.execute()
+
+            if failed_attempts >= User.MAX_LOGIN_ATTEMPTS:
+                unlock_time = datetime.now(timezone.utc) + User.LOCKOUT_DURATION
+                redis_client.set(
+                    f"{LOCK_KEY_PREFIX}{user.user_id}",
+                    unlock_time.timestamp(),
+                    ex=User.LOCKOUT_DURATION,
+                )
+                redis_client.delete(counter_key)
+        except RedisError as e:
+            logger.warning(f"Redis unavailable, failed login kept in DB only: {e}")
+
+        background_tasks.add_task(
+            run_with_own_session, User.handle_failed_login, user.user_id
+        )
 
     @staticmethod
     def reset_failed_login_attempts(user: User) -> None:
         """
         Reset failed login attempts for a user.
 
+        The DB columns are only written when they hold a failed attempt.
+
         Args:
             user (User): The user to reset failed login attempts for.
         """
-        User.reset_failed_login_attempts(user.user_id)
+        try:
+            redis_client.delete(
+                f"{LOCKOUT_COUNTER_KEY_PREFIX}{user.user_id}",
+                f"{LOCK_KEY_PREFIX}{user.user_id}",
+            )
+        except RedisError as e:
+            logger.warning(f"Redis unavailable, could not reset lockout counter: {e}")
+
+        if user.failed_login_attempts or user.account_locked_until:
+            User.reset_failed_login_attempts(user.user_id)
 
     @staticmethod
     def get_user_role(user_id: int) -> GenericResponseModel:
@@ -366,6 +478,7 @@ class UserService:
         items_per_page: int,
         filter_params: Optional[List[Dict[str, str]]] = None,
         sorting_params: Optional[List[Dict[str, str]]] = None,
+        cursor: Optional[str] = None,
     ) -> GenericResponseModel:
         """
         Get all users with pending approval status.
@@ -375,20 +488,24 @@ class UserService:
             items_per_page (int): The number of items per page.
             filter_params (Optional[List[Dict[str, str]]]): The filters to apply.
             sorting_params (Optional[List[Dict[str, str]]]): The sorting parameters to apply.
+            cursor (Optional[str]): The next_cursor of the previous page.
 
         Returns:
             GenericResponseModel: A GenericResponseModel with the list of pending users or an error.
         """
         # Get pending approval users
-        pending_users, total_items = User.get_users_by_status(
+        pending_users, total_items, next_position = User.get_users_by_status(
             UserStatus.INACTIVE,
             current_page,
             items_per_page,
             filter_params,
             sorting_params,
+            decode_cursor(cursor) if cursor else None,
         )
 
-        total_pages = math.ceil(total_items / items_per_page)
+        total_pages = (
+            -(-total_items // items_per_page) if total_items is not None else None
+        )
 
         # Return a GenericResponseModel with the list of pending users
         return GenericResponseModel(
@@ -401,6 +518,7 @@ class UserService:
                 total_pages=total_pages,
                 total_items=total_items,
                 items=pending_users,
+                next_cursor=encode_cursor(*next_position) if next_position else None,
             ),
         )
 
@@ -410,6 +528,7 @@ class UserService:
         Approve a school representative account.
 
         This method changes the status of a user from PENDING_APPROVAL to ACTIVE.
+        A user that does not exist or is not pending approval is reported as not found.
 
         Args:
             user_id (int): The ID of the user to approve.
@@ -418,7 +537,9 @@ class UserService:
             GenericResponseModel: A response model containing the result of the operation.
         """
         logger.info(f"Approving school representative with ID: {user_id}, user_id={context_actor_user_data.get().user_id}")
-        user = User.update_user_status(user_id, UserStatus.ACTIVE)
+        user = User.update_user_status(
+            user_id, UserStatus.ACTIVE, expected_status=UserStatus.INACTIVE
+        )
 
         if user:
             logger.info(
@@ -456,7 +577,7 @@ class UserService:
                 data=user,
             )
         else:
-            logger.warning(f"User with ID {user_id} not found for approval")
+            logger.warning(f"User with ID {user_id} not found or not pending approval")
             return GenericResponseModel(
                 api_id=context_id_api.get(),
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -547,7 +668,7 @@ class UserService:
                 current_page, items_per_page, filter_params, sorting_params
             )
 
-            total_pages = math.ceil(total_count / items_per_page)
+            total_pages = -(-total_count // items_per_page)
 
             pagination_data = PaginationResponseDataModel(
                 current_page=current_page,
@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+from threading import Lock
+from typing import Optional, Set
+
+from app.context_manager import context_db_session, context_id_api
+from app.core.config import settings
+from app.database import SessionLocal
+from app.logger import logger
+from app.utils.exceptions import CustomBadRequestException
+from app.utils.response_messages import ResponseMessages
+
+
+class WaitingListProcessor:
+    """
+    Coalesce waiting list processing triggers per event date.
+
+    schedule() only records the event date ID. A background task wakes once
+    per window and runs process_waiting_list a single time for every
+    distinct ID collected, so a burst of freed spots on one event date
+    costs one queue scan instead of one per trigger.
+
+    Args:
+        window_seconds (float): How long to collect triggers before processing them.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._pending: Set[int] = set()
+        self._lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background task on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task; triggers still pending are dropped."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._loop = self._wakeup = self._task = None
+
+    def schedule(self, event_date_id: int) -> None:
+        """
+        Request processing of an event date's waiting list.
+
+        Safe to call from worker threads as well as from the event loop.
+
+        Args:
+            event_date_id (int): The ID of the event date whose spots changed.
+        """
+        loop = self._loop
+        if loop is None:
+            logger.warning(
+                "Waiting list processor is not running, skipping event date ID: %s",
+                event_date_id,
+            )
+            return
+        with self._lock:
+            self._pending.add(event_date_id)
+        loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Let the window fill up before draining it
+            await asyncio.sleep(self.window_seconds)
+            self._wakeup.clear()
+            with self._lock:
+                event_date_ids, self._pending = self._pending, set()
+            for event_date_id in event_date_ids:
+                await asyncio.to_thread(self._process, event_date_id)
+
+    @staticmethod
+    def _process(event_date_id: int) -> None:
+        from app.service.waiting_list_service import WaitingListService
+
+        db = SessionLocal()
+        db_token = context_db_session.set(db)
+        api_token = context_id_api.set(str(uuid.uuid4()))
+        try:
+            WaitingListService.process_waiting_list(event_date_id)
+        except CustomBadRequestException as e:
+            # service_errors reports unexpected errors, already logged with
+            # their traceback, as an internal server error
+            if e.detail == ResponseMessages.ERR_INTERNAL_SERVER_ERROR:
+                logger.error(
+                    "Background waiting list processing failed for event date ID: %s",
+                    event_date_id,
+                )
+            else:
+                logger.info(
+                    "Skipped waiting list processing for event date ID: %s. Reason: %s",
+                    event_date_id,
+                    e.detail,
+                )
+        finally:
+            context_id_api.reset(api_token)
+            context_db_session.reset(db_token)
+            db.close()
+
+
+waiting_list_processor = WaitingListProcessor(
+    settings.WAITING_LIST_BATCH_WINDOW_MS / 1000
+)
@@ -2,6 +2,9 @@ from datetime import datetime
 from fastapi import HTTPException, status
 from pytz import timezone
 
+# Resolved once; the lookup is not repeated on every raise
+_SLOVAKIA_TZ = timezone("Europe/Bratislava")
+
 
 class CustomAuthException(HTTPException):
     """Exception for invalid authentication credentials."""
@@ -44,8 +47,7 @@ class CustomAccountLockedException(HTTPException):
     """Exception for locked user accounts."""
 
     def __init__(self, unlock_time: datetime) -> None:
-        slovakia_tz = timezone("Europe/Bratislava")
-        local_time = unlock_time.astimezone(slovakia_tz)
+        local_time = unlock_time.astimezone(_SLOVAKIA_TZ)
         formatted_time = local_time.strftime("%d.%m.%Y %H:%M:%S")
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,106 +1,176 @@
 import base64
+import hashlib
+import logging
 import secrets
-import uuid
-from datetime import datetime
+import time
 from typing import Callable, Optional
 
+import jwt
 from app.core.config import settings
-from app.database import SessionLocal
-from app.logger import logger
-from fastapi import Request
-from jose import JWTError, jwt
-from sqlalchemy.exc import DBAPIError, OperationalError
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
-
-
-class BaseAuthMiddleware(BaseHTTPMiddleware):
-    def unauthorized(self, realm: Optional[str] = None) -> Response:
-        response = Response("Unauthorized", status_code=401)
-        if realm:
-            response.headers["WWW-Authenticate"] = f'Basic realm="{realm}"'
-        return response
-
-
-class CombinedAuthMiddleware(BaseAuthMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = request.url.path
+from app.logger import context_request_id, logger
+from app.utils.ttl_cache import TTLCache
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_FILES_PREFIX = "/files/"
+_DOCS_REALM = "Access to the API docs"
+# The decoded Basic credentials the docs accept, compared as one blob
+_EXPECTED_BASIC_CREDENTIALS = f"{settings.API_LOGIN}:{settings.API_PASSWORD}".encode()
+
+_JWT_CACHE_TTL = 30
+_jwt_cache = TTLCache(maxsize=10_000, ttl=_JWT_CACHE_TTL)
+
+
+def _verify_cached(token: str) -> dict:
+    """
+    Decode a JWT, reusing the payload of a recent successful decode.
+
+    The cache is keyed by a digest of the token, so the raw token is never
+    kept in memory. A payload is only cached when its expiry lies beyond the
+    cache TTL, which guarantees an expired token is never served from it.
+
+    Args:
+        token (str): The encoded JWT.
+
+    Returns:
+        dict: The decoded payload.
+
+    Raises:
+        jwt.InvalidTokenError: If the token is invalid or expired.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _jwt_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    if exp is None or exp - time.time() > _JWT_CACHE_TTL:
+        _jwt_cache.set(key, payload)
+    return payload
+
+
+def _unauthorized_headers(realm: Optional[str] = None) -> tuple:
+    headers = ((b"content-length", b"12"),)
+    if realm:
+        headers += ((b"www-authenticate", f'Basic realm="{realm}"'.encode("latin-1")),)
+    return headers
+
+
+# 401 headers are constant per realm, so they are encoded once
+_UNAUTHORIZED_HEADERS = {
+    None: _unauthorized_headers(),
+    _DOCS_REALM: _unauthorized_headers(_DOCS_REALM),
+}
+
+
+async def _send_unauthorized(send: Send, realm: Optional[str] = None) -> None:
+    """Send a plain 401 straight through ASGI, without building a Response."""
+    headers = _UNAUTHORIZED_HEADERS.get(realm) or _unauthorized_headers(realm)
+    # Fresh message dicts, since outer middleware may rewrite them in place
+    await send(
+        {"type": "http.response.start", "status": 401, "headers": list(headers)}
+    )
+    await send({"type": "http.response.body", "body": b"Unauthorized"})
+
+
+def _get_raw_header(scope: Scope, name: bytes) -> Optional[bytes]:
+    """Return the first raw value of a lowercase header name from the scope."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _check_files_token(scope: Scope, path: str) -> bool:
+    """Return whether the request carries a valid token for this file."""
+    token = QueryParams(scope["query_string"]).get("token")
+    if not token:
+        logger.warning("Token missing in request to files endpoint.")
+        return False
+
+    try:
+        payload = _verify_cached(token)
+        file_path = payload.get("file_path")
+        if not file_path or not path.endswith(file_path):
+            logger.warning("Invalid or mismatched file path in token.")
+            return False
+    except jwt.InvalidTokenError as e:
+        logger.error("JWT decoding error for files: %s", e)
+        return False
+    return True
+
+
+def _check_docs_auth(scope: Scope) -> bool:
+    """Return whether the request carries the API docs credentials."""
+    auth_header = _get_raw_header(scope, b"authorization")
+    # Compare the scheme on the raw bytes, without decoding the header
+    if not auth_header or auth_header[:6].lower() != b"basic ":
+        return False
+
+    try:
+        decoded = base64.b64decode(auth_header[6:])
+    except (ValueError, base64.binascii.Error) as e:
+        logger.error("Error parsing authorization header: %s", e)
+        return False
+    return secrets.compare_digest(decoded, _EXPECTED_BASIC_CREDENTIALS)
+
+
+# Exact paths guarded by a check, mapped to the check and the realm of its 401
+_AUTH_CHECKS: dict[str, tuple[Callable[[Scope], bool], Optional[str]]] = {
+    "/docs": (_check_docs_auth, _DOCS_REALM),
+    "/redoc": (_check_docs_auth, _DOCS_REALM),
+    "/openapi.json": (_check_docs_auth, _DOCS_REALM),
+}
+
+
+class CombinedRequestMiddleware:
+    """
+    Single ASGI pass for file and docs auth and request timing.
+
+    This replaces separate BaseHTTPMiddleware layers, each of which ran the
+    rest of the stack in its own task behind a memory stream. Database
+    sessions are owned by the get_db dependency, which FastAPI runs in its
+    threadpool, so nothing here touches the database on the event loop.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(_FILES_PREFIX):
+            if not _check_files_token(scope, path):
+                await _send_unauthorized(send)
+                return
+        else:
+            auth_check = _AUTH_CHECKS.get(path)
+            if auth_check is not None:
+                check, realm = auth_check
+                if not check(scope):
+                    await _send_unauthorized(send, realm=realm)
+                    return
+
+        request_id_token = context_request_id.set(secrets.token_hex(8))
+        start_ns = time.perf_counter_ns()
 
         try:
-            if path.startswith("/files/"):
-                token = request.query_params.get("token")
-                if not token:
-                    logger.warning("Token missing in request to files endpoint.")
-                    return self.unauthorized()
-
-                try:
-                    payload = jwt.decode(
-                        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-                    )
-                    file_path = payload.get("file_path")
-                    if not file_path or not path.endswith(file_path):
-                        logger.warning("Invalid or mismatched file path in token.")
-                        return self.unauthorized()
-                except JWTError as e:
-                    logger.error(f"JWT decoding error for files: {e}")
-                    return self.unauthorized()
-
-            elif path in ["/docs", "/redoc", "/openapi.json"]:
-                auth_header = request.headers.get("Authorization")
-                if not auth_header:
-                    return self.unauthorized(realm="Access to the API docs")
-
-                try:
-                    scheme, credentials = auth_header.split()
-                    if scheme.lower() != "basic":
-                        return self.unauthorized(realm="Access to the API docs")
-
-                    decoded = base64.b64decode(credentials).decode("ascii")
-                    username, password = decoded.split(":")
-                    if not (
-                        secrets.compare_digest(username, settings.API_LOGIN)
-                        and secrets.compare_digest(password, settings.API_PASSWORD)
-                    ):
-                        return self.unauthorized(realm="Access to the API docs")
-                except (ValueError, base64.binascii.Error) as e:
-                    logger.error(f"Error parsing authorization header: {e}")
-                    return self.unauthorized(realm="Access to the API docs")
-
-            response = await call_next(request)
+            await self.app(scope, receive, send)
         except Exception as e:
-            logger.error(f"Error in CombinedAuthMiddleware: {e}")
-            raise e
-
-        return response
-
-
-class CombinedDBSessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        analytical_request_id = str(uuid.uuid4())
-        start_time = datetime.now()
-
-        request.state.db = SessionLocal()
-        request.state.db.begin()  # Explicitly begin a transaction
-
-        try:
-            response = await call_next(request)
-            request.state.db.commit()  # Commit transaction after request handling
-        except (OperationalError, DBAPIError) as e:
-            request.state.db.rollback()  # Rollback on database-related exceptions
-            logger.error(f"Database error in middleware: {e}")
-            raise e
-        except Exception as e:
-            request.state.db.rollback()  # Rollback on general exceptions
-            logger.error(f"Error in CombinedDBSessionMiddleware: {e}")
+            logger.error("Error in CombinedRequestMiddleware: %s", e)
             raise e
         finally:
-            request.state.db.close()  # Always close the session
-
-            duration = (datetime.now() - start_time).total_seconds() * 1000
-            logger.info(
-                f"Request {analytical_request_id} ended for path: {request.url.path}. Duration: {duration:.2f} ms"
-            )
-
-        return response
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Request ended for path: %s. Duration: %.2f ms",
+                    path,
+                    (time.perf_counter_ns() - start_ns) / 1_000_000,
+                )
+            context_request_id.reset(request_id_token)
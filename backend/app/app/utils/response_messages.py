@@ -1,135 +1,165 @@
+from typing import Final
+
+
 class ResponseMessages:
+    """
+    Namespace of the API's response and error message strings.
+
+    The members are plain str class attributes rather than Enum members.
+    Reading one is a single class attribute load, which CPython 3.11
+    specializes, while Enum members go through the metaclass. Plain strings
+    also format as their text in f-strings and pass unchanged through
+    pydantic and orjson.
+    """
+
+    # Never instantiated; no per-instance __dict__ if it ever is
+    __slots__ = ()
+
     # Success messages
-    MSG_SUCCESS_LOGIN = "Login successful"
-    MSG_SUCCESS_LOGOUT = "Logout successful"
-    MSG_SUCCESS_ADD_LABORANT = "Successfully added laborant"
-    MSG_SUCCESS_REMOVE_LABORANT = "Successfully removed laborant"
-    MSG_SUCCESS_CREATE_USER = "User created successfully"
-    MSG_SUCCESS_GET_USER_PROJECTS = "User projects retrieved successfully"
-    MSG_SUCCESS_GET_ALL_USERS = "All users retrieved successfully"
-    MSG_SUCCESS_UPDATE_USER = "User updated successfully"
-    MSG_SUCCESS_GET_USER = "User retrieved successfully"
-    MSG_SUCCESS_DELETE_USER = "User deleted successfully"
-    MSG_SUCCESS_GET_USER_ROLE = "User role retrieved successfully"
-    ERR_ACCOUNT_PENDING_APPROVAL = "Account pending approval"
-
-    MSG_SUCCESS_CREATE_EVENT = "Event created successfully"
-    MSG_SUCCESS_UPDATE_EVENT = "Event updated successfully"
-    MSG_SUCCESS_DELETE_EVENT = "Event deleted successfully"
-    MSG_SUCCESS_GET_EVENT = "Event retrieved successfully"
-    MSG_SUCCESS_GET_ALL_EVENTS = "All events retrieved successfully"
-    MSG_SUCCESS_GET_ORGANIZER_EVENTS = "Organizer events retrieved successfully"
-    MSG_SUCCESS_GET_PENDING_USERS = "Pending users retrieved successfully"
-    MSG_SUCCESS_APPROVE_USER = "User approved successfully"
-    MSG_SUCCESS_REJECT_USER = "User rejected successfully"
-
-    MSG_SUCCESS_CREATE_RESERVATION = "Reservation created successfully"
-    MSG_SUCCESS_UPDATE_RESERVATION = "Reservation updated successfully"
-    MSG_SUCCESS_DELETE_RESERVATION = "Reservation deleted successfully"
-    MSG_SUCCESS_GET_RESERVATION = "Reservation retrieved successfully"
-    MSG_SUCCESS_GET_ALL_RESERVATIONS = "All reservations retrieved successfully"
-    MSG_SUCCESS_GET_USER_RESERVATIONS = "User reservations retrieved successfully"
-    MSG_SUCCESS_GET_USER_EVENT_RESERVATIONS = (
+    MSG_SUCCESS_LOGIN: Final = "Login successful"
+    MSG_SUCCESS_LOGOUT: Final = "Logout successful"
+    MSG_SUCCESS_ADD_LABORANT: Final = "Successfully added laborant"
+    MSG_SUCCESS_REMOVE_LABORANT: Final = "Successfully removed laborant"
+    MSG_SUCCESS_CREATE_USER: Final = "User created successfully"
+    MSG_SUCCESS_GET_USER_PROJECTS: Final = "User projects retrieved successfully"
+    MSG_SUCCESS_GET_ALL_USERS: Final = "All users retrieved successfully"
+    MSG_SUCCESS_UPDATE_USER: Final = "User updated successfully"
+    MSG_SUCCESS_GET_USER: Final = "User retrieved successfully"
+    MSG_SUCCESS_DELETE_USER: Final = "User deleted successfully"
+    MSG_SUCCESS_GET_USER_ROLE: Final = "User role retrieved successfully"
+    ERR_ACCOUNT_PENDING_APPROVAL: Final = "Account pending approval"
+
+    MSG_SUCCESS_CREATE_EVENT: Final = "Event created successfully"
+    MSG_SUCCESS_UPDATE_EVENT: Final = "Event updated successfully"
+    MSG_SUCCESS_DELETE_EVENT: Final = "Event deleted successfully"
+    MSG_SUCCESS_GET_EVENT: Final = "Event retrieved successfully"
+    MSG_SUCCESS_GET_ALL_EVENTS: Final = "All events retrieved successfully"
+    MSG_SUCCESS_GET_ORGANIZER_EVENTS: Final = "Organizer events retrieved successfully"
+    MSG_SUCCESS_GET_PENDING_USERS: Final = "Pending users retrieved successfully"
+    MSG_SUCCESS_APPROVE_USER: Final = "User approved successfully"
+    MSG_SUCCESS_REJECT_USER: Final = "User rejected successfully"
+
+    MSG_SUCCESS_CREATE_RESERVATION: Final = "Reservation created successfully"
+    MSG_SUCCESS_UPDATE_RESERVATION: Final = "Reservation updated successfully"
+    MSG_SUCCESS_DELETE_RESERVATION: Final = "Reservation deleted successfully"
+    MSG_SUCCESS_GET_RESERVATION: Final = "Reservation retrieved successfully"
+    MSG_SUCCESS_GET_ALL_RESERVATIONS: Final = "All reservations retrieved successfully"
+    MSG_SUCCESS_GET_USER_RESERVATIONS: Final = (
+        "User reservations retrieved successfully"
+    )
+    MSG_SUCCESS_GET_USER_EVENT_RESERVATIONS: Final = (
         "User event reservations retrieved successfully"
     )
-    MSG_SUCCESS_GET_PARENT_ORGANIZER = "Parent organizer retrieved successfully"
-    MSG_SUCCESS_MARK_PAID = "Reservation marked as paid successfully"
-    MSG_SUCCESS_MARK_COMPLETED = "Reservation marked as completed successfully"
+    MSG_SUCCESS_GET_PARENT_ORGANIZER: Final = "Parent organizer retrieved successfully"
+    MSG_SUCCESS_MARK_PAID: Final = "Reservation marked as paid successfully"
+    MSG_SUCCESS_MARK_COMPLETED: Final = "Reservation marked as completed successfully"
 
     # Error messages
-    ERR_USER_NOT_FOUND = "User not found"
-    ERR_LABORANT_NOT_ASSIGNED_TO_USER = "Laborant not assigned to user"
-    ERR_USER_ALREADY_EXISTS = "User already exists"
-    ERR_EMAIL_ALREADY_TAKEN = "Email already taken"
-    ERR_ROUTE_NOT_FOUND = "Route not found"
-    ERR_INVALID_USER_CREDENTIALS = "Invalid user credentials"
-    ERR_INVALID_REFRESH_TOKEN = "Invalid refresh token"
-    ERR_USER_NOT_LOGGED_IN = "User not logged in"
-    ERR_TOKEN_EXPIRED = "Token expired"
-    ERR_TOKEN_INVALID = "Token invalid"
-    ERR_TOKEN_NOT_PROVIDED = "Token not provided"
-    ERR_INVALID_DATA = "Invalid data"
-    ERR_INVALID_USER_ID = "Invalid user ID"
-    ERR_MARK_PAID = "Error marking reservation as paid"
-    ERR_MARK_COMPLETED = "Error marking reservation as completed"
-
-    ERR_EVENT_NOT_FOUND = "Event not found"
-    ERR_CREATE_EVENT = "Error creating event"
-    ERR_INVALID_EVENT_DATE_DATA = "Invalid event date data"
-
-    ERR_RESERVATION_NOT_FOUND = "Reservation not found"
-    ERR_INSUFFICIENT_CAPACITY = "Insufficient capacity for the reservation"
-    ERR_INVALID_RESERVATION_DATA = "Invalid reservation data"
-    ERR_INVALID_NUMBER_OF_SEATS = (
+    ERR_USER_NOT_FOUND: Final = "User not found"
+    ERR_LABORANT_NOT_ASSIGNED_TO_USER: Final = "Laborant not assigned to user"
+    ERR_USER_ALREADY_EXISTS: Final = "User already exists"
+    ERR_EMAIL_ALREADY_TAKEN: Final = "Email already taken"
+    ERR_ROUTE_NOT_FOUND: Final = "Route not found"
+    ERR_INVALID_USER_CREDENTIALS: Final = "Invalid user credentials"
+    ERR_INVALID_REFRESH_TOKEN: Final = "Invalid refresh token"
+    ERR_USER_NOT_LOGGED_IN: Final = "User not logged in"
+    ERR_TOKEN_EXPIRED: Final = "Token expired"
+    ERR_TOKEN_INVALID: Final = "Token invalid"
+    ERR_TOKEN_NOT_PROVIDED: Final = "Token not provided"
+    ERR_INVALID_DATA: Final = "Invalid data"
+    ERR_INVALID_USER_ID: Final = "Invalid user ID"
+    ERR_MARK_PAID: Final = "Error marking reservation as paid"
+    ERR_MARK_COMPLETED: Final = "Error marking reservation as completed"
+
+    ERR_EVENT_NOT_FOUND: Final = "Event not found"
+    ERR_CREATE_EVENT: Final = "Error creating event"
+    ERR_INVALID_EVENT_DATE_DATA: Final = "Invalid event date data"
+
+    ERR_RESERVATION_NOT_FOUND: Final = "Reservation not found"
+    ERR_INSUFFICIENT_CAPACITY: Final = "Insufficient capacity for the reservation"
+    ERR_INVALID_RESERVATION_DATA: Final = "Invalid reservation data"
+    ERR_INVALID_NUMBER_OF_SEATS: Final = (
         "Invalid number of seats. The number of seats must be greater than zero."
     )
-    MSG_SUCCESS_FIND_RESERVATION = "Reservation found"
-    MSG_NO_PARENT_ORGANIZER_FOUND = "No parent organizer found"
-    ERR_RESERVATION_ALREADY_CANCELLED = "Reservation already cancelled"
-    ERR_UPDATE_EVENT = "Error updating event"
-    MSG_SUCCESS_GET_RESERVATIONS_BY_EVENT = "Reservations retrieved successfully"
-    MSG_SUCCESS_CONFIRM_RESERVATION = "Reservation confirmed successfully"
-    ERR_EVENT_DATE_NOT_FOUND = (
+    MSG_SUCCESS_FIND_RESERVATION: Final = "Reservation found"
+    MSG_NO_PARENT_ORGANIZER_FOUND: Final = "No parent organizer found"
+    ERR_RESERVATION_ALREADY_CANCELLED: Final = "Reservation already cancelled"
+    ERR_UPDATE_EVENT: Final = "Error updating event"
+    MSG_SUCCESS_GET_RESERVATIONS_BY_EVENT: Final = "Reservations retrieved successfully"
+    MSG_SUCCESS_CONFIRM_RESERVATION: Final = "Reservation confirmed successfully"
+    ERR_EVENT_DATE_NOT_FOUND: Final = (
         "The specified event date was not found or does not belong to the event."
     )
-    MSG_SUCCESS_GET_EVENT_DATE = "Event date retrieved successfully"
+    MSG_SUCCESS_GET_EVENT_DATE: Final = "Event date retrieved successfully"
 
     # School messages
-    ERR_MISSING_SCHOOL_DATA = "Missing school data"
-    ERR_SCHOOL_ALREADY_REGISTERED = "School already registered"
-    SCHOOL_CREATION_FAILED = "School creation failed"
+    ERR_MISSING_SCHOOL_DATA: Final = "Missing school data"
+    ERR_SCHOOL_ALREADY_REGISTERED: Final = "School already registered"
+    SCHOOL_CREATION_FAILED: Final = "School creation failed"
 
-    ERR_INTERNAL_SERVER_ERROR = "Internal server error"
+    ERR_INTERNAL_SERVER_ERROR: Final = "Internal server error"
 
-    MSG_SUCCESS_GET_ORGANIZERS = "Organizers retrieved successfully"
+    MSG_SUCCESS_GET_ORGANIZERS: Final = "Organizers retrieved successfully"
 
     # Waiting list messages
-    MSG_SUCCESS_ADD_TO_WAITING_LIST = "Added to waiting list successfully"
-    MSG_SUCCESS_PROCESS_WAITING_LIST = "Processed waiting list successfully"
-    MSG_SUCCESS_GET_USER_WAITING_LIST = (
+    MSG_SUCCESS_ADD_TO_WAITING_LIST: Final = "Added to waiting list successfully"
+    MSG_SUCCESS_PROCESS_WAITING_LIST: Final = "Processed waiting list successfully"
+    MSG_SUCCESS_GET_USER_WAITING_LIST: Final = (
         "User waiting list entries retrieved successfully"
     )
-    MSG_SUCCESS_UPDATE_WAITING_LIST_ENTRY = "Waiting list entry updated successfully"
-    MSG_SUCCESS_DELETE_WAITING_LIST_ENTRY = "Waiting list entry deleted successfully"
-    MSG_SUCCESS_GET_WAITING_LIST_ENTRIES = "Waiting list entries retrieved successfully"
-    MSG_SUCCESS_GET_WAITING_LIST = "Waiting list retrieved successfully"
-    MSG_SUCCESS_GET_WAITING_LIST_ENTRY = "Waiting list entry retrieved successfully"
+    MSG_SUCCESS_UPDATE_WAITING_LIST_ENTRY: Final = (
+        "Waiting list entry updated successfully"
+    )
+    MSG_SUCCESS_DELETE_WAITING_LIST_ENTRY: Final = (
+        "Waiting list entry deleted successfully"
+    )
+    MSG_SUCCESS_GET_WAITING_LIST_ENTRIES: Final = (
+        "Waiting list entries retrieved successfully"
+    )
+    MSG_SUCCESS_GET_WAITING_LIST: Final = "Waiting list retrieved successfully"
+    MSG_SUCCESS_GET_WAITING_LIST_ENTRY: Final = (
+        "Waiting list entry retrieved successfully"
+    )
 
-    ERR_INVALID_WAITING_LIST_DATA = "Invalid waiting list data"
-    ERR_EVENT_DATE_LOCKED = "Event date is locked"
-    MSG_NO_WAITING_LIST_ENTRIES = "No waiting list entries found"
-    ERR_WAITING_LIST_ENTRY_NOT_FOUND = "Waiting list entry not found"
+    ERR_INVALID_WAITING_LIST_DATA: Final = "Invalid waiting list data"
+    ERR_EVENT_DATE_LOCKED: Final = "Event date is locked"
+    MSG_NO_WAITING_LIST_ENTRIES: Final = "No waiting list entries found"
+    ERR_WAITING_LIST_ENTRY_NOT_FOUND: Final = "Waiting list entry not found"
+    ERR_ALREADY_ON_WAITING_LIST: Final = (
+        "User is already on the waiting list for this event date"
+    )
 
     # Report messages
-    MSG_SUCCESS_GENERATE_REPORT = "Report generated successfully"
-    MSG_SUCCESS_GET_ALL_REPORTS = "All reports retrieved successfully"
-    MSG_SUCCESS_GET_REPORT = "Report retrieved successfully"
-    MSG_SUCCESS_EXPORT_REPORT = "Report exported successfully"
-    MSG_SUCCESS_SAVE_REPORT = "Report saved successfully"
-    MSG_SUCCESS_DELETE_REPORT = "Report deleted successfully"
+    MSG_SUCCESS_GENERATE_REPORT: Final = "Report generated successfully"
+    MSG_SUCCESS_GET_ALL_REPORTS: Final = "All reports retrieved successfully"
+    MSG_SUCCESS_GET_REPORT: Final = "Report retrieved successfully"
+    MSG_SUCCESS_EXPORT_REPORT: Final = "Report exported successfully"
+    MSG_SUCCESS_SAVE_REPORT: Final = "Report saved successfully"
+    MSG_SUCCESS_DELETE_REPORT: Final = "Report deleted successfully"
 
-    ERR_REPORT_NOT_FOUND = "Report not found"
-    ERR_INVALID_REPORT_INPUT = "Invalid input for report generation"
+    ERR_REPORT_NOT_FOUND: Final = "Report not found"
+    ERR_INVALID_REPORT_INPUT: Final = "Invalid input for report generation"
+    ERR_INVALID_REPORT_TYPE: Final = "Invalid report type"
 
     # Event claims
-    MSG_SUCCESS_CREATE_CLAIM = "Claim created successfully"
-    MSG_SUCCESS_GET_PENDING_CLAIMS = "Pending claims retrieved successfully"
+    MSG_SUCCESS_CREATE_CLAIM: Final = "Claim created successfully"
+    MSG_SUCCESS_GET_PENDING_CLAIMS: Final = "Pending claims retrieved successfully"
 
-    ERR_GET_PENDING_CLAIMS = "Error getting pending claims"
-    ERR_CREATE_CLAIM = "Error creating claim"
-    ERR_CLAIM_NOT_FOUND = "Claim not found"
-    ERR_UPDATE_CLAIM = "Error updating claim"
-    MSG_SUCCESS_UPDATE_CLAIM = "Claim updated successfully"
+    ERR_GET_PENDING_CLAIMS: Final = "Error getting pending claims"
+    ERR_CREATE_CLAIM: Final = "Error creating claim"
+    ERR_CLAIM_NOT_FOUND: Final = "Claim not found"
+    ERR_UPDATE_CLAIM: Final = "Error updating claim"
+    MSG_SUCCESS_UPDATE_CLAIM: Final = "Claim updated successfully"
 
-    MSG_SUCCESS_GET_STATISTICS = "Statistics retrieved successfully"
-    ERR_GENERATING_STATISTICS = "Error generating statistics"
+    MSG_SUCCESS_GET_STATISTICS: Final = "Statistics retrieved successfully"
+    ERR_GENERATING_STATISTICS: Final = "Error generating statistics"
 
-    MSG_SUCCESS_GET_ALL_EVENTS_WITH_DATES = (
+    MSG_SUCCESS_GET_ALL_EVENTS_WITH_DATES: Final = (
         "All events with dates retrieved successfully"
     )
 
-    MSG_PASSWORD_CHANGED = "Password changed successfully"
+    MSG_PASSWORD_CHANGED: Final = "Password changed successfully"
 
-    MSG_SUCCESS_GET_LOGS = "Logs retrieved successfully"
+    MSG_SUCCESS_GET_LOGS: Final = "Logs retrieved successfully"
 
-    MSG_SUCCESS_REJECT_RESERVATION = "Reservation rejected successfully"
\ No newline at end of file
+    MSG_SUCCESS_REJECT_RESERVATION: Final = "Reservation rejected successfully"
\ No newline at end of file
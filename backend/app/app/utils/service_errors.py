@@ -0,0 +1,55 @@
+from functools import wraps
+from typing import Callable, Optional, TypeVar
+
+from app.logger import logger
+from app.utils.exceptions import CustomBadRequestException
+from app.utils.response_messages import ResponseMessages
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+F = TypeVar("F", bound=Callable)
+
+
+def service_errors(
+    operation: str, invalid_data_message: Optional[str] = None
+) -> Callable[[F], F]:
+    """
+    Map errors escaping a service method onto the API error taxonomy.
+
+    HTTP exceptions (including the custom ones) pass through untouched.
+    A pydantic ValidationError becomes invalid_data_message when given.
+    Anything else is logged once with its traceback and reported as an
+    internal server error.
+
+    Args:
+        operation (str): The name of the operation, used in the log line.
+        invalid_data_message (Optional[str]): The ResponseMessages entry for validation errors.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except ValidationError:
+                if invalid_data_message is None:
+                    logger.exception("Unexpected validation error in %s", operation)
+                    raise CustomBadRequestException(
+                        ResponseMessages.ERR_INTERNAL_SERVER_ERROR
+                    )
+                logger.warning("Validation error in %s", operation)
+                raise CustomBadRequestException(invalid_data_message)
+            except Exception:
+                logger.exception("Unexpected error in %s", operation)
+                raise CustomBadRequestException(
+                    ResponseMessages.ERR_INTERNAL_SERVER_ERROR
+                )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Args:
+        maxsize (int): The maximum number of entries kept; the least recently used is evicted first.
+        ttl (float): The lifetime of an entry in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop the entry for key if present."""
+        with self._lock:
+            self._data.pop(key, None)
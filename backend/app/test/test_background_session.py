@@ -0,0 +1,12 @@
+from app.context_manager import get_db_session, run_with_own_session
+
+
+def test_background_task_gets_its_own_session(db):
+    sessions = []
+
+    run_with_own_session(lambda: sessions.append(get_db_session()))
+
+    [task_session] = sessions
+    assert task_session is not db
+    # The request session is back in the context once the task finishes
+    assert get_db_session() is db
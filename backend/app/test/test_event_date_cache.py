@@ -0,0 +1,20 @@
+from app.data_adapter.event import EventDate
+
+
+def test_cached_event_date_is_a_model_dict_the_caller_cannot_corrupt(
+    db, add_event_date
+):
+    event_date_id = add_event_date(available_spots=5)
+    EventDate.invalidate(event_date_id)
+
+    first = EventDate.get_event_date_by_id(event_date_id)
+    assert first["id"] == event_date_id
+    assert first["available_spots"] == 5
+    first["available_spots"] = 0
+
+    # The second lookup is served from the cache
+    second = EventDate.get_event_date_by_id(event_date_id)
+    assert second is not first
+    assert second["available_spots"] == 5
+
+    EventDate.invalidate(event_date_id)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from app.data_adapter.user import User
+from app.models.user import UserRole, UserStatus
+
+
+def _add_users(db, count: int, user_status: UserStatus, created_at: datetime):
+    users = [
+        User(
+            first_name="Test",
+            last_name=f"User {i}",
+            user_email=f"{user_status.value}-{i}@example.com",
+            password_hash="hash",
+            role=UserRole.SCHOOL_REPRESENTATIVE,
+            status=user_status,
+            # Pairs of users share a timestamp so the user_id tie-break matters
+            created_at=created_at - timedelta(minutes=i // 2),
+        )
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return [(user.created_at, user.user_id) for user in users]
+
+
+def test_pending_users_keyset_pages_have_no_duplicates_or_gaps(db):
+    now = datetime(2024, 1, 1, 12, 0)
+    pending = _add_users(db, 8, UserStatus.INACTIVE, now)
+    _add_users(db, 3, UserStatus.ACTIVE, now)
+
+    page, total, cursor = User.get_users_by_status(UserStatus.INACTIVE, 1, 3)
+    assert total == 8
+    seen = [user.user_id for user in page]
+
+    while cursor:
+        page, total, cursor = User.get_users_by_status(
+            UserStatus.INACTIVE, 1, 3, cursor=cursor
+        )
+        # Cursor pages skip the COUNT query
+        assert total is None
+        seen.extend(user.user_id for user in page)
+
+    assert seen == [user_id for _, user_id in sorted(pending, reverse=True)]
+
+
+def test_pending_users_last_page_has_no_cursor(db):
+    _add_users(db, 3, UserStatus.INACTIVE, datetime(2024, 1, 1, 12, 0))
+
+    page, total, cursor = User.get_users_by_status(UserStatus.INACTIVE, 1, 3)
+
+    assert len(page) == 3
+    assert total == 3
+    assert cursor is None
@@ -0,0 +1,61 @@
+from app.data_adapter.log import Log
+from app.data_adapter.user import User
+from app.models.user import UserRole, UserStatus
+
+
+def _add_user(db, user_status: UserStatus) -> int:
+    user = User(
+        first_name="Test",
+        last_name="User",
+        user_email="status@example.com",
+        password_hash="hash",
+        role=UserRole.SCHOOL_REPRESENTATIVE,
+        status=user_status,
+    )
+    db.add(user)
+    db.commit()
+    return user.user_id
+
+
+def _status_logs(db, user_id: int) -> list[Log]:
+    logs = db.query(Log).filter(
+        Log.table_name == "user", Log.table_primary_key == user_id
+    )
+    # The insert of the test user is logged too, without old data
+    return [log for log in logs if log.old_data]
+
+
+def test_status_update_queues_audit_row(db):
+    user_id = _add_user(db, UserStatus.INACTIVE)
+
+    user = User.update_user_status(
+        user_id, UserStatus.ACTIVE, expected_status=UserStatus.INACTIVE
+    )
+
+    assert user.status == UserStatus.ACTIVE
+    [log] = _status_logs(db, user_id)
+    assert log.old_data["status"] == UserStatus.INACTIVE.value
+    assert log.new_data["status"] == UserStatus.ACTIVE.value
+
+
+def test_status_update_refreshes_a_user_loaded_in_the_session(db):
+    user_id = _add_user(db, UserStatus.INACTIVE)
+    loaded = db.get(User, user_id)
+    assert loaded.status == UserStatus.INACTIVE
+
+    user = User.update_user_status(user_id, UserStatus.ACTIVE)
+
+    assert user.status == UserStatus.ACTIVE
+    [log] = _status_logs(db, user_id)
+    assert log.new_data["status"] == UserStatus.ACTIVE.value
+
+
+def test_status_update_with_stale_expected_status_is_not_audited(db):
+    user_id = _add_user(db, UserStatus.ACTIVE)
+
+    user = User.update_user_status(
+        user_id, UserStatus.ACTIVE, expected_status=UserStatus.INACTIVE
+    )
+
+    assert user is None
+    assert _status_logs(db, user_id) == []
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.data_adapter.event import EventDate
+from app.data_adapter.user import User
+from app.data_adapter.waiting_list import WaitingList
+from app.models.user import UserRole
+from app.models.waiting_list import WaitingListStatus
+
+INDEX_NAME = "uq_waiting_list_event_date_user_waiting"
+
+
+def _index_exists(db) -> bool:
+    return db.execute(select(func.to_regclass(INDEX_NAME))).scalar() is not None
+
+
+def _entry(event_date: EventDate, user_id: int, position: int) -> WaitingList:
+    return WaitingList(
+        event_date_id=event_date.id,
+        event_id=event_date.event_id,
+        user_id=user_id,
+        number_of_students=1,
+        number_of_teachers=0,
+        contact_info="contact",
+        status=WaitingListStatus.WAITING,
+        position=position,
+    )
+
+
+def test_index_is_created_on_a_table_with_duplicate_entries(db, add_event_date):
+    # A database created before the index was declared
+    db.execute(text(f"DROP INDEX {INDEX_NAME}"))
+    event_date = db.get(EventDate, add_event_date(available_spots=0))
+    user = User(
+        first_name="Test",
+        last_name="User",
+        user_email="duplicate@example.com",
+        password_hash="hash",
+        role=UserRole.SCHOOL_REPRESENTATIVE,
+    )
+    db.add(user)
+    db.flush()
+    entries = [_entry(event_date, user.user_id, position) for position in (3, 1, 2)]
+    db.add_all(entries)
+    db.commit()
+    entry_ids = [entry.id for entry in entries]
+
+    WaitingList.ensure_active_entry_index(db.connection())
+    db.commit()
+
+    assert _index_exists(db)
+    statuses = dict(
+        db.execute(
+            select(WaitingList.position, WaitingList.status).where(
+                WaitingList.id.in_(entry_ids)
+            )
+        ).all()
+    )
+    # Only the entry with the lowest position stays in the queue
+    assert statuses == {
+        1: WaitingListStatus.WAITING,
+        2: WaitingListStatus.CANCELLED,
+        3: WaitingListStatus.CANCELLED,
+    }
+
+    db.add(_entry(event_date, user.user_id, 4))
+    with pytest.raises(IntegrityError):
+        db.flush()
+    db.rollback()
+
+
+def test_index_setup_is_a_no_op_when_the_index_exists(db):
+    WaitingList.ensure_active_entry_index(db.connection())
+    WaitingList.ensure_active_entry_index(db.connection())
+
+    assert _index_exists(db)
@@ -0,0 +1,151 @@
+import pytest
+
+from app.data_adapter.event import EventDate
+from app.data_adapter.log import Log
+from app.data_adapter.reservation import Reservation
+from app.data_adapter.user import User
+from app.data_adapter.waiting_list import WaitingList
+from app.models.user import UserRole
+from app.models.waiting_list import WaitingListStatus
+from app.service.waiting_list_service import WaitingListService
+from app.utils.exceptions import CustomBadRequestException
+
+
+def _add_waiting_entries(db, event_date_id: int, sizes: list[int]) -> list[int]:
+    event_id = db.get(EventDate, event_date_id).event_id
+    # An active entry is unique per event date and user
+    users = [
+        User(
+            first_name="Test",
+            last_name=f"User {position}",
+            user_email=f"waiting-{position}@example.com",
+            password_hash="hash",
+            role=UserRole.SCHOOL_REPRESENTATIVE,
+        )
+        for position in range(len(sizes))
+    ]
+    db.add_all(users)
+    db.flush()
+    entries = [
+        WaitingList(
+            event_date_id=event_date_id,
+            event_id=event_id,
+            user_id=user.user_id,
+            number_of_students=size,
+            number_of_teachers=0,
+            contact_info="contact",
+            status=WaitingListStatus.WAITING,
+            position=position,
+        )
+        for position, (user, size) in enumerate(zip(users, sizes), start=1)
+    ]
+    db.add_all(entries)
+    db.commit()
+    return [entry.id for entry in entries]
+
+
+def _change_logs(db, table: str) -> list[Log]:
+    # Inserts made by the test setup carry no old data
+    return [
+        log
+        for log in db.query(Log).filter(Log.table_name == table)
+        if log.old_data
+    ]
+
+
+def test_processing_writes_audit_rows_for_every_batch(db, add_event_date):
+    event_date_id = add_event_date(available_spots=7)
+    first, second, third = _add_waiting_entries(db, event_date_id, [3, 3, 5])
+    setup_log_ids = {log.log_id for log in db.query(Log)}
+
+    response = WaitingListService.process_waiting_list(event_date_id)
+
+    assert response.data == {"processed_entries": 2}
+    new_logs = [log for log in db.query(Log) if log.log_id not in setup_log_ids]
+
+    reservation_logs = [log for log in new_logs if log.table_name == "reservation"]
+    reservation_ids = {reservation.id for reservation in db.query(Reservation)}
+    assert {log.table_primary_key for log in reservation_logs} == reservation_ids
+    assert all(log.old_data is None for log in reservation_logs)
+
+    [event_date_log] = _change_logs(db, "event_date")
+    assert event_date_log.old_data["available_spots"] == 7
+    assert event_date_log.new_data["available_spots"] == 1
+
+    waiting_logs = {
+        log.table_primary_key: log for log in _change_logs(db, "waiting_list")
+    }
+    assert set(waiting_logs) == {first, second, third}
+    for entry_id in (first, second):
+        assert waiting_logs[entry_id].old_data["status"] == "waiting"
+        assert waiting_logs[entry_id].new_data["status"] == "processed"
+    assert waiting_logs[third].old_data["position"] == 3
+    assert waiting_logs[third].new_data["position"] == 1
+
+
+def test_adding_an_entry_writes_an_audit_row(db, add_event_date):
+    event_date_id = add_event_date(available_spots=0)
+    _add_waiting_entries(db, event_date_id, [2])
+    user = User(
+        first_name="Test",
+        last_name="Newcomer",
+        user_email="newcomer@example.com",
+        password_hash="hash",
+        role=UserRole.SCHOOL_REPRESENTATIVE,
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.user_id
+
+    new_entry = WaitingList.add_if_event_unlocked(
+        {
+            "event_date_id": event_date_id,
+            "user_id": user_id,
+            "number_of_students": 4,
+            "number_of_teachers": 1,
+            "contact_info": "contact",
+        }
+    )
+
+    [log] = db.query(Log).filter(
+        Log.table_name == "waiting_list", Log.table_primary_key == new_entry.id
+    )
+    assert log.new_data["user_id"] == user_id
+    assert log.new_data["position"] == 2
+
+
+def test_updating_an_entry_writes_an_audit_row(db, add_event_date):
+    event_date_id = add_event_date(available_spots=0)
+    [entry_id] = _add_waiting_entries(db, event_date_id, [2])
+
+    entry = WaitingList.update_if_event_unlocked(
+        entry_id, {"number_of_students": 6, "contact_info": None}
+    )
+
+    assert entry.number_of_students == 6
+    [log] = _change_logs(db, "waiting_list")
+    assert log.table_primary_key == entry_id
+    assert log.old_data["number_of_students"] == 2
+    assert log.new_data["number_of_students"] == 6
+    assert log.old_data["contact_info"] == log.new_data["contact_info"] == "contact"
+
+
+def test_failed_processing_rolls_back_the_whole_batch(
+    db, add_event_date, monkeypatch
+):
+    event_date_id = add_event_date(available_spots=7)
+    entry_ids = _add_waiting_entries(db, event_date_id, [3, 3])
+    setup_log_count = db.query(Log).count()
+    # Fail after the reservations were inserted
+    monkeypatch.setattr(
+        EventDate, "decrement_spots", classmethod(lambda *args: False)
+    )
+
+    with pytest.raises(CustomBadRequestException):
+        WaitingListService.process_waiting_list(event_date_id)
+
+    assert db.query(Reservation).count() == 0
+    assert db.get(EventDate, event_date_id).available_spots == 7
+    entries = db.query(WaitingList).filter(WaitingList.id.in_(entry_ids))
+    assert {entry.status for entry in entries} == {WaitingListStatus.WAITING}
+    assert db.query(Log).count() == setup_log_count
@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import app.service.waiting_list_processor as waiting_list_processor_module
+from app.service.waiting_list_processor import WaitingListProcessor
+from app.service.waiting_list_service import WaitingListService
+from app.utils.exceptions import CustomBadRequestException
+from app.utils.response_messages import ResponseMessages
+
+
+def _run_processor(monkeypatch, triggers) -> list[int]:
+    processed = []
+    monkeypatch.setattr(
+        WaitingListProcessor, "_process", staticmethod(processed.append)
+    )
+
+    async def run():
+        processor = WaitingListProcessor(window_seconds=0.02)
+        await processor.start()
+        await triggers(processor)
+        await asyncio.sleep(0.1)
+        await processor.stop()
+
+    asyncio.run(run())
+    return processed
+
+
+def test_triggers_within_one_window_are_processed_once(monkeypatch):
+    async def triggers(processor):
+        for event_date_id in (1, 2, 1, 1, 2):
+            processor.schedule(event_date_id)
+        # Request threads schedule through the same pending set
+        await asyncio.to_thread(processor.schedule, 1)
+
+    assert sorted(_run_processor(monkeypatch, triggers)) == [1, 2]
+
+
+def test_trigger_after_a_drained_window_is_processed_again(monkeypatch):
+    async def triggers(processor):
+        processor.schedule(1)
+        await asyncio.sleep(0.1)
+        processor.schedule(1)
+
+    assert _run_processor(monkeypatch, triggers) == [1, 1]
+
+
+def test_schedule_without_a_running_processor_is_dropped(monkeypatch):
+    processed = []
+    monkeypatch.setattr(
+        WaitingListProcessor, "_process", staticmethod(processed.append)
+    )
+
+    WaitingListProcessor(window_seconds=0.02).schedule(1)
+
+    assert processed == []
+
+
+def _process_with_error(monkeypatch, error: Exception) -> MagicMock:
+    def fail(event_date_id: int):
+        raise error
+
+    monkeypatch.setattr(WaitingListService, "process_waiting_list", fail)
+    log = MagicMock()
+    monkeypatch.setattr(waiting_list_processor_module, "logger", log)
+    WaitingListProcessor._process(1)
+    return log
+
+
+def test_internal_error_in_background_processing_is_logged_as_a_failure(monkeypatch):
+    log = _process_with_error(
+        monkeypatch,
+        CustomBadRequestException(ResponseMessages.ERR_INTERNAL_SERVER_ERROR),
+    )
+
+    log.error.assert_called_once()
+    log.info.assert_not_called()
+
+
+def test_rejected_background_processing_is_logged_as_skipped(monkeypatch):
+    log = _process_with_error(
+        monkeypatch, CustomBadRequestException(ResponseMessages.ERR_EVENT_DATE_LOCKED)
+    )
+
+    log.info.assert_called_once()
+    log.error.assert_not_called()